@@ -1,14 +1,14 @@
 """The Vivint integration."""
 
+from functools import partial
 import logging
 import os
 
 from aiohttp import ClientResponseError
 from aiohttp.client_exceptions import ClientConnectorError
 from vivintpy.devices import VivintDevice
-from vivintpy.devices.alarm_panel import DEVICE_DELETED, DEVICE_DISCOVERED
+from vivintpy.devices.alarm_panel import DEVICE_DELETED, DEVICE_DISCOVERED, AlarmPanel
 from vivintpy.devices.camera import DOORBELL_DING, MOTION_DETECTED, Camera
-from vivintpy.devices.wireless_sensor import WirelessSensor
 from vivintpy.enums import CapabilityCategoryType
 from vivintpy.exceptions import (
     VivintSkyApiAuthenticationError,
@@ -20,16 +20,38 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_DEVICE_ID,
     ATTR_DOMAIN,
+    CONF_USERNAME,
     EVENT_HOMEASSISTANT_STOP,
     Platform,
 )
-from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.core import Context, Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
-from homeassistant.helpers import device_registry
-from homeassistant.helpers.dispatcher import async_dispatcher_send
-
-from .const import CONF_REFRESH_TOKEN, DOMAIN, EVENT_TYPE
-from .hub import VivintHub, get_device_id
+from homeassistant.helpers import config_validation as cv, device_registry
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    CONF_DISARM_CODE,
+    CONF_EVENT_LOG,
+    CONF_HD_STREAM,
+    CONF_PREROLL_CAMERAS,
+    CONF_PREROLL_SECONDS,
+    CONF_REFRESH_TOKEN,
+    CONF_RTSP_STREAM,
+    CONF_RTSP_URL_LOGGING,
+    CONF_SNAPSHOT_INTERVAL,
+    DEFAULT_EVENT_LOG,
+    DOMAIN,
+    EVENT_TYPE,
+)
+from .hub import VivintHub, async_get_device_trigger_index, get_device_id
+from .manager import async_get_manager
+from .services import async_setup_services
+from .timeline import remove_log
 
 type VivintConfigEntry = ConfigEntry[VivintHub]
 
@@ -46,6 +68,7 @@ PLATFORMS = [
     Platform.EVENT,
     Platform.LIGHT,
     Platform.LOCK,
+    Platform.SELECT,
     Platform.SENSOR,
     Platform.SWITCH,
     Platform.UPDATE,
@@ -53,84 +76,129 @@ PLATFORMS = [
 
 ATTR_TYPE = "type"
 
+# Options that entities apply in place, any other option change reloads the entry
+LIVE_OPTIONS = {
+    CONF_DISARM_CODE,
+    CONF_EVENT_LOG,
+    CONF_HD_STREAM,
+    CONF_PREROLL_CAMERAS,
+    CONF_PREROLL_SECONDS,
+    CONF_RTSP_STREAM,
+    CONF_RTSP_URL_LOGGING,
+    CONF_SNAPSHOT_INTERVAL,
+}
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Vivint integration."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: VivintConfigEntry) -> bool:
     """Set up Vivint from a config entry."""
     undo_listener = entry.add_update_listener(update_listener)
 
-    hub = VivintHub(hass, entry.data, undo_listener)
+    manager = async_get_manager(hass)
+    if hub := manager.async_take_hub(entry.data[CONF_USERNAME]):
+        # adopt the hub the config flow just authenticated
+        hub.async_attach_entry(entry, undo_listener)
+    else:
+        hub = VivintHub(hass, entry.data, undo_listener, entry.entry_id, entry.options)
     entry.runtime_data = hub
 
     try:
-        await hub.login(load_devices=True, subscribe_for_realtime_updates=True)
+        if hub.logged_in:
+            await hub.async_load()
+        else:
+            await hub.login(load_devices=True, subscribe_for_realtime_updates=True)
     except (VivintSkyApiMfaRequiredError, VivintSkyApiAuthenticationError) as ex:
+        await hub.disconnect()
         raise ConfigEntryAuthFailed(ex) from ex
     except (VivintSkyApiError, ClientResponseError, ClientConnectorError) as ex:
+        await hub.disconnect()
         raise ConfigEntryNotReady(ex) from ex
+    except Exception:
+        await hub.disconnect()
+        raise
+
+    entry.async_on_unload(manager.async_register_poll(hub.coordinator))
+
+    if entry.options.get(CONF_EVENT_LOG, DEFAULT_EVENT_LOG):
+        await hub.timeline.async_enable_log(get_event_log_path(hass, entry))
 
     dev_reg = device_registry.async_get(hass)
+    device_triggers = async_get_device_trigger_index(hass)
 
     @callback
-    def async_on_device_discovered(device: VivintDevice) -> None:
-        if getattr(device, "battery_level", None) is not None:
-            async_dispatcher_send(hass, f"{DOMAIN}_{entry.entry_id}_add_sensor", device)
-        if isinstance(device, WirelessSensor):
-            async_dispatcher_send(
-                hass, f"{DOMAIN}_{entry.entry_id}_add_binary_sensor", device
-            )
+    def async_on_device_discovered(event: dict) -> None:
+        device: VivintDevice = event["device"]
+        _LOGGER.debug("Device discovered: %s", device)
+        async_subscribe_device_events(device)
+        hub.async_add_discovered_device(device)
 
     @callback
-    def async_on_device_deleted(device: VivintDevice) -> None:
-        _LOGGER.debug("Device deleted: %s", device)
-        device = dev_reg.async_get_device({get_device_id(device)})
+    def async_on_device_deleted(event: dict) -> None:
+        _LOGGER.debug("Device deleted: %s", event["device"])
+        device = dev_reg.async_get_device({get_device_id(event["device"])})
         if device:
             dev_reg.async_remove_device(device.id)
 
     @callback
-    def async_on_device_event(event_type: str, viv_device: VivintDevice) -> None:
-        """Relay Vivint device event to hass."""
-        device = dev_reg.async_get_device({get_device_id(viv_device)})
-        hass.bus.async_fire(
-            EVENT_TYPE,
-            {
-                ATTR_TYPE: event_type,
-                ATTR_DOMAIN: DOMAIN,
-                ATTR_DEVICE_ID: device.id,
-            },
-        )
+    def async_on_device_event(event_type: str, event: dict) -> None:
+        """Relay Vivint device event to device triggers and the event bus."""
+        if not (device := dev_reg.async_get_device({get_device_id(event["device"])})):
+            return
+        event_data = {
+            ATTR_TYPE: event_type,
+            ATTR_DOMAIN: DOMAIN,
+            ATTR_DEVICE_ID: device.id,
+        }
+        hub.timeline.async_record(device.id, event_type)
+        context = Context()
+        device_triggers.async_fire(device.id, event_type, event_data, context)
+        hass.bus.async_fire(EVENT_TYPE, event_data, context=context)
 
-    for system in hub.account.systems:
-        for alarm_panel in system.alarm_panels:
-            entry.async_on_unload(
-                alarm_panel.on(
-                    DEVICE_DISCOVERED,
-                    lambda event: async_on_device_discovered(event["device"]),
-                )
+    @callback
+    def async_subscribe_device_events(device: VivintDevice) -> None:
+        """Relay motion and doorbell events of a camera."""
+        if not isinstance(device, Camera):
+            return
+        entry.async_on_unload(
+            hub.async_subscribe(
+                device, MOTION_DETECTED, partial(async_on_device_event, MOTION_DETECTED)
             )
+        )
+        if CapabilityCategoryType.DOORBELL in device.capabilities:
             entry.async_on_unload(
-                alarm_panel.on(
-                    DEVICE_DELETED,
-                    lambda event: async_on_device_deleted(event["device"]),
+                hub.async_subscribe(
+                    device, DOORBELL_DING, partial(async_on_device_event, DOORBELL_DING)
                 )
             )
-            for device in alarm_panel.get_devices([Camera]):
-                entry.async_on_unload(
-                    device.on(
-                        MOTION_DETECTED,
-                        lambda event: async_on_device_event(
-                            MOTION_DETECTED, event["device"]
-                        ),
-                    )
-                )
-                if CapabilityCategoryType.DOORBELL in device.capabilities:
-                    entry.async_on_unload(
-                        device.on(
-                            DOORBELL_DING,
-                            lambda event: async_on_device_event(
-                                DOORBELL_DING, event["device"]
-                            ),
-                        )
-                    )
+
+    @callback
+    def async_setup_alarm_panel(alarm_panel: AlarmPanel) -> None:
+        """Relay the discovery and device events of an alarm panel."""
+        entry.async_on_unload(
+            hub.async_subscribe(
+                alarm_panel, DEVICE_DISCOVERED, async_on_device_discovered
+            )
+        )
+        entry.async_on_unload(
+            hub.async_subscribe(alarm_panel, DEVICE_DELETED, async_on_device_deleted)
+        )
+        for device in alarm_panel.devices:
+            async_subscribe_device_events(device)
+
+    for system in hub.account.systems:
+        for alarm_panel in system.alarm_panels:
+            async_setup_alarm_panel(alarm_panel)
+    # systems that could not be loaded during setup are announced once they load
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, hub.panel_signal, async_setup_alarm_panel)
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -138,21 +206,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: VivintConfigEntry) -> bo
     stored_devices = device_registry.async_entries_for_config_entry(
         dev_reg, entry.entry_id
     )
-    alarm_panels = [
-        alarm_panel
-        for system in hub.account.systems
-        for alarm_panel in system.alarm_panels
-    ]
-    all_devices = alarm_panels + [
-        device for alarm_panel in alarm_panels for device in alarm_panel.devices
-    ]
     known_devices = [
-        dev_reg.async_get_device({get_device_id(device)}) for device in all_devices
+        dev_reg.async_get_device({get_device_id(device)}) for device in hub.devices
     ]
+    # devices of systems that are still loading are kept
+    pending_prefixes = tuple(f"{panel_id}-" for panel_id in hub.pending_systems)
 
     # Devices that are in the device registry that are not known by the hub can be removed
     for device in stored_devices:
-        if device not in known_devices:
+        if device not in known_devices and not any(
+            domain == DOMAIN and identifier.startswith(pending_prefixes)
+            for domain, identifier in device.identifiers
+        ):
             dev_reg.async_remove_device(device.id)
 
     @callback
@@ -174,6 +239,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: VivintConfigEntry) -> b
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: VivintConfigEntry) -> None:
+    """Remove the on-disk event log of a removed config entry."""
+    await hass.async_add_executor_job(remove_log, get_event_log_path(hass, entry))
+
+
+def get_event_log_path(hass: HomeAssistant, entry: VivintConfigEntry) -> str:
+    """Return the path of the on-disk event log for a config entry."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}_events_{entry.entry_id}.jsonl")
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: VivintConfigEntry) -> bool:
     """Migrate old entry."""
     _LOGGER.debug(
@@ -205,4 +280,26 @@ async def async_migrate_entry(hass: HomeAssistant, entry: VivintConfigEntry) ->
 
 async def update_listener(hass: HomeAssistant, entry: VivintConfigEntry) -> None:
     """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    hub = entry.runtime_data
+    options = dict(entry.options)
+    changed = {
+        key
+        for key in options.keys() | hub.options.keys()
+        if options.get(key) != hub.options.get(key)
+    }
+    if not changed:
+        # only the entry data changed, such as a saved refresh token
+        return
+
+    hub.options = options
+    if changed - LIVE_OPTIONS:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    if CONF_EVENT_LOG in changed:
+        if options.get(CONF_EVENT_LOG, DEFAULT_EVENT_LOG):
+            await hub.timeline.async_enable_log(get_event_log_path(hass, entry))
+        else:
+            await hub.timeline.async_disable_log()
+
+    async_dispatcher_send(hass, hub.options_signal, options)
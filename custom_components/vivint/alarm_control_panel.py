@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Any, Iterable
 
+from vivintpy.devices import VivintDevice
 from vivintpy.devices.alarm_panel import AlarmPanel
 from vivintpy.enums import ArmedState
 
@@ -14,13 +15,14 @@ from homeassistant.components.alarm_control_panel import (
     AlarmControlPanelState,
     CodeFormat,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import VivintConfigEntry
 from .const import CONF_DISARM_CODE, DOMAIN
-from .hub import VivintEntity, VivintHub
+from .hub import VivintEntity, VivintHub, async_add_device_entities
 
 ARMED_STATE_MAP = {
     ArmedState.DISARMED: AlarmControlPanelState.DISARMED,
@@ -43,25 +45,29 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Vivint alarm control panel using config entry."""
-    entities = []
     hub: VivintHub = entry.runtime_data
-    disarm_code = entry.options.get(CONF_DISARM_CODE)
-
-    for system in hub.account.systems:
-        for device in system.alarm_panels:
-            entities.append(
-                VivintAlarmControlPanelEntity(
-                    device=device, hub=hub, disarm_code=disarm_code
-                )
+
+    @callback
+    def async_get_entities(
+        devices: Iterable[VivintDevice],
+    ) -> list[VivintAlarmControlPanelEntity]:
+        """Get alarm control panel entities for the given devices."""
+        entities = [
+            VivintAlarmControlPanelEntity(
+                device=device, hub=hub, disarm_code=hub.options.get(CONF_DISARM_CODE)
             )
+            for device in devices
+            if isinstance(device, AlarmPanel)
+        ]
 
-    if not entities:
-        return
+        # Migrate unique ids
+        async_update_unique_id(hass, PLATFORM, entities)
 
-    # Migrate unique ids
-    async_update_unique_id(hass, PLATFORM, entities)
+        return entities
 
-    async_add_entities(entities)
+    entry.async_on_unload(
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
+    )
 
 
 class VivintAlarmControlPanelEntity(VivintEntity, AlarmControlPanelEntity):
@@ -78,10 +84,32 @@ class VivintAlarmControlPanelEntity(VivintEntity, AlarmControlPanelEntity):
     ) -> None:
         """Create the entity."""
         super().__init__(device, hub)
-        self._attr_unique_id = str(self.device.id)
-        if disarm_code:
-            self._attr_code_format = CodeFormat.NUMBER
-            self._disarm_code = disarm_code
+        self._set_disarm_code(disarm_code)
+
+    def _get_state_snapshot(self) -> ArmedState:
+        """Return the armed state of the panel."""
+        return self.device.state
+
+    def _set_disarm_code(self, disarm_code: str | None) -> None:
+        """Set the code required to disarm the alarm panel."""
+        self._attr_code_format = CodeFormat.NUMBER if disarm_code else None
+        self._disarm_code = disarm_code
+
+    async def async_added_to_hass(self) -> None:
+        """Register callbacks."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self.hub.options_signal, self._async_options_updated
+            )
+        )
+
+    @callback
+    def _async_options_updated(self, options: dict[str, Any]) -> None:
+        """Apply a changed disarm code."""
+        if (disarm_code := options.get(CONF_DISARM_CODE)) != self._disarm_code:
+            self._set_disarm_code(disarm_code)
+            self.async_write_ha_state()
 
     @property
     def alarm_state(self) -> AlarmControlPanelState | None:
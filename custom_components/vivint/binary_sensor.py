@@ -2,31 +2,26 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 
+from vivintpy.const import WirelessSensorAttribute
 from vivintpy.devices import BypassTamperDevice, VivintDevice
 from vivintpy.devices.camera import MOTION_DETECTED, Camera
 from vivintpy.devices.wireless_sensor import WirelessSensor
 from vivintpy.enums import EquipmentType, SensorType
 
 from homeassistant.components.binary_sensor import (
-    DOMAIN as PLATFORM_DOMAIN,
     BinarySensorDeviceClass,
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
-from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_call_later
-from homeassistant.util.dt import utcnow
 
 from . import VivintConfigEntry
-from .const import DOMAIN
-from .hub import VivintBaseEntity, VivintEntity, VivintHub
+from .hub import VivintBaseEntity, VivintEntity, VivintHub, async_add_device_entities
 
 MOTION_STOPPED_SECONDS = 30
 
@@ -34,6 +29,31 @@ ENTITY_DESCRIPTION_MOTION = BinarySensorEntityDescription(
     "motion", device_class=BinarySensorDeviceClass.MOTION
 )
 
+EQUIPMENT_TYPE_DEVICE_CLASSES = {
+    EquipmentType.MOTION: BinarySensorDeviceClass.MOTION,
+    EquipmentType.FREEZE: BinarySensorDeviceClass.COLD,
+    EquipmentType.WATER: BinarySensorDeviceClass.MOISTURE,
+    EquipmentType.TEMPERATURE: BinarySensorDeviceClass.HEAT,
+}
+# Device class of contact sensors by sensor type, with an optional device class for
+# equipment codes that contain a given name
+CONTACT_DEVICE_CLASSES: dict[
+    SensorType,
+    tuple[BinarySensorDeviceClass, tuple[str, BinarySensorDeviceClass] | None],
+] = {
+    SensorType.EXIT_ENTRY_1: (
+        BinarySensorDeviceClass.DOOR,
+        ("TILT", BinarySensorDeviceClass.GARAGE_DOOR),
+    ),
+    SensorType.PERIMETER: (
+        BinarySensorDeviceClass.WINDOW,
+        ("GLASS_BREAK", BinarySensorDeviceClass.SAFETY),
+    ),
+    SensorType.FIRE: (BinarySensorDeviceClass.SMOKE, None),
+    SensorType.FIRE_WITH_VERIFICATION: (BinarySensorDeviceClass.SMOKE, None),
+    SensorType.CARBON_MONOXIDE: (BinarySensorDeviceClass.GAS, None),
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -41,60 +61,61 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Vivint binary sensors using config entry."""
-    entities = []
     hub: VivintHub = entry.runtime_data
 
-    for system in hub.account.systems:
-        for alarm_panel in system.alarm_panels:
-            for device in alarm_panel.devices:
-                entities.extend(
-                    VivintBinarySensorEntity(
-                        device=device, hub=hub, entity_description=description
-                    )
-                    for cls, descriptions in BINARY_SENSORS.items()
-                    if isinstance(device, cls)
-                    for description in descriptions
+    @callback
+    def async_get_entities(devices: Iterable[VivintDevice]) -> list[BinarySensorEntity]:
+        """Get binary sensor entities for the given devices."""
+        entities: list[BinarySensorEntity] = []
+        for device in devices:
+            entities.extend(
+                VivintBinarySensorEntity(
+                    device=device, hub=hub, entity_description=description
                 )
-                if isinstance(device, WirelessSensor):
-                    entities.append(VivintBinarySensorEntityOld(device=device, hub=hub))
-                elif isinstance(device, Camera):
-                    entities.append(
-                        VivintCameraBinarySensorEntity(
-                            device=device,
-                            hub=hub,
-                            entity_description=ENTITY_DESCRIPTION_MOTION,
-                        )
+                for cls, descriptions in BINARY_SENSORS.items()
+                if isinstance(device, cls)
+                for description in descriptions
+            )
+            if isinstance(device, WirelessSensor):
+                entities.append(VivintBinarySensorEntityOld(device=device, hub=hub))
+            elif isinstance(device, Camera):
+                entities.append(
+                    VivintCameraBinarySensorEntity(
+                        device=device,
+                        hub=hub,
+                        entity_description=ENTITY_DESCRIPTION_MOTION,
                     )
-                if hasattr(device, "is_online"):
-                    entities.append(
-                        VivintBinarySensorEntity(
-                            device=device,
-                            hub=hub,
-                            entity_description=ONLINE_SENSOR_ENTITY_DESCRIPTION,
-                        )
+                )
+            if hasattr(device, "is_online"):
+                entities.append(
+                    VivintBinarySensorEntity(
+                        device=device,
+                        hub=hub,
+                        entity_description=ONLINE_SENSOR_ENTITY_DESCRIPTION,
                     )
+                )
+        return entities
 
-    if not entities:
-        return
-
-    async_add_entities(entities)
-
-    @callback
-    def async_add_sensor(device: VivintDevice) -> None:
-        """Add Vivint binary sensor."""
-        entities: list[VivintBinarySensorEntityOld] = []
-        if isinstance(device, WirelessSensor):
-            entities.append(VivintBinarySensorEntityOld(device=device, hub=hub))
+    entry.async_on_unload(
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
+    )
 
-        async_add_entities(entities)
 
-    entry.async_on_unload(
-        async_dispatcher_connect(
-            hass,
-            f"{DOMAIN}_{entry.entry_id}_add_{PLATFORM_DOMAIN}",
-            async_add_sensor,
+def get_wireless_sensor_device_class(
+    device: WirelessSensor,
+) -> BinarySensorDeviceClass | None:
+    """Return the device class of a wireless sensor."""
+    equipment_type = device.equipment_type
+    if equipment_type != EquipmentType.CONTACT:
+        return EQUIPMENT_TYPE_DEVICE_CLASSES.get(
+            equipment_type, BinarySensorDeviceClass.SAFETY
         )
-    )
+    if (device_classes := CONTACT_DEVICE_CLASSES.get(device.sensor_type)) is None:
+        return None
+    device_class, code_device_class = device_classes
+    if code_device_class and code_device_class[0] in device.equipment_code.name:
+        return code_device_class[1]
+    return device_class
 
 
 @dataclass
@@ -143,72 +164,56 @@ class VivintBinarySensorEntity(VivintBaseEntity, BinarySensorEntity):
 
     entity_description: VivintBinarySensorEntityDescription
 
+    def _get_state_snapshot(self) -> bool:
+        """Return whether the sensor is on."""
+        return self.entity_description.is_on(self.device)
+
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
-        return self.entity_description.is_on(self.device)
+        return self._state_snapshot
 
 
 class VivintBinarySensorEntityOld(VivintEntity, BinarySensorEntity):
     """Vivint Binary Sensor."""
 
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
-        return f"{self.device.alarm_panel.id}-{self.device.id}"
+    device: WirelessSensor
+    _state_snapshot: bool
 
-    @property
-    def is_on(self) -> bool:
-        """Return true if the binary sensor is on."""
+    def _get_state_snapshot(self) -> bool:
+        """Return whether the sensor is on."""
         return self.device.is_on
 
     @property
-    def device_class(self) -> BinarySensorDeviceClass:
-        """Return the class of this device."""
-        equipment_type = self.device.equipment_type
-
-        if equipment_type == EquipmentType.MOTION:
-            return BinarySensorDeviceClass.MOTION
-
-        elif equipment_type == EquipmentType.FREEZE:
-            return BinarySensorDeviceClass.COLD
-
-        elif equipment_type == EquipmentType.WATER:
-            return BinarySensorDeviceClass.MOISTURE
-
-        elif equipment_type == EquipmentType.TEMPERATURE:
-            return BinarySensorDeviceClass.HEAT
-
-        elif equipment_type == EquipmentType.CONTACT:
-            sensor_type = self.device.sensor_type
-
-            if sensor_type == SensorType.EXIT_ENTRY_1:
-                return (
-                    BinarySensorDeviceClass.GARAGE_DOOR
-                    if "TILT" in self.device.equipment_code.name
-                    else BinarySensorDeviceClass.DOOR
-                )
-
-            elif sensor_type == SensorType.PERIMETER:
-                return (
-                    BinarySensorDeviceClass.SAFETY
-                    if "GLASS_BREAK" in self.device.equipment_code.name
-                    else BinarySensorDeviceClass.WINDOW
-                )
-
-            elif sensor_type in [SensorType.FIRE, SensorType.FIRE_WITH_VERIFICATION]:
-                return BinarySensorDeviceClass.SMOKE
+    def is_on(self) -> bool:
+        """Return true if the binary sensor is on."""
+        return self._state_snapshot
 
-            elif sensor_type == SensorType.CARBON_MONOXIDE:
-                return BinarySensorDeviceClass.GAS
+    def _get_metadata(self) -> tuple:
+        """Return the device metadata that the entity's static attributes use."""
+        data = self.device.data
+        return (
+            self.device.name,
+            data.get(WirelessSensorAttribute.EQUIPMENT_TYPE),
+            data.get(WirelessSensorAttribute.SENSOR_TYPE),
+            data.get(WirelessSensorAttribute.EQUIPMENT_CODE),
+        )
 
-        else:
-            return BinarySensorDeviceClass.SAFETY
+    def _update_metadata_attributes(self) -> None:
+        """Resolve the attributes that only change with the device metadata."""
+        super()._update_metadata_attributes()
+        self._attr_device_class = get_wireless_sensor_device_class(self.device)
 
 
 class VivintCameraBinarySensorEntity(VivintEntity, BinarySensorEntity):
     """Vivint Camera Binary Sensor."""
 
+    _attr_is_on = False
+
+    def _get_state_snapshot(self) -> tuple:
+        """Return an empty snapshot, motion is not part of the device state."""
+        return ()
+
     def __init__(
         self,
         device: VivintDevice,
@@ -218,58 +223,38 @@ class VivintCameraBinarySensorEntity(VivintEntity, BinarySensorEntity):
         """Pass coordinator to CoordinatorEntity."""
         super().__init__(device=device, hub=hub)
         self.entity_description = entity_description
-        self._last_motion_event: datetime | None = None
-        self._motion_stopped_callback: CALLBACK_TYPE = None
 
-    @property
-    def name(self) -> str:
-        """Return the name of this entity."""
-        return f"{self.device.name} Motion"
-
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
-        return f"{self.device.alarm_panel.id}-{self.device.id}"
-
-    @property
-    def is_on(self) -> bool:
-        """Return true if the binary sensor is on."""
-        return (
-            self._last_motion_event is not None
-            and self._last_motion_event >= utcnow() - timedelta(seconds=30)
-        )
+    def _update_metadata_attributes(self) -> None:
+        """Resolve the attributes that only change with the device metadata."""
+        self._attr_name = f"{self.device.name} Motion"
 
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
         await super().async_added_to_hass()
-        self.async_on_remove(self.device.on(MOTION_DETECTED, self._motion_callback))
+        self.async_on_remove(
+            self.hub.async_subscribe(
+                self.device, MOTION_DETECTED, self._motion_callback
+            )
+        )
 
     async def async_will_remove_from_hass(self) -> None:
         """Disconnect callbacks."""
         await super().async_will_remove_from_hass()
-        self.async_cancel_motion_stopped_callback()
+        self.hub.motion_expiry.async_cancel(self)
 
     @callback
     def _motion_callback(self, _) -> None:
         """Call motion method."""
-        self.async_cancel_motion_stopped_callback()
-
-        self._last_motion_event = utcnow()
-        self.async_write_ha_state()
+        if not self._attr_is_on:
+            self._attr_is_on = True
+            self.async_write_ha_state()
 
-        self._motion_stopped_callback = async_call_later(
-            self.hass, MOTION_STOPPED_SECONDS, self.async_motion_stopped_callback
+        self.hub.motion_expiry.async_schedule(
+            self, MOTION_STOPPED_SECONDS, self.async_motion_stopped_callback
         )
 
-    async def async_motion_stopped_callback(self, *_) -> None:
+    @callback
+    def async_motion_stopped_callback(self) -> None:
         """Motion stopped callback."""
-        self._motion_stopped_callback = None
-        self._last_motion_event = None
+        self._attr_is_on = False
         self.async_write_ha_state()
-
-    @callback
-    def async_cancel_motion_stopped_callback(self) -> None:
-        """Clear the motion stopped callback if it has not already fired."""
-        if self._motion_stopped_callback is not None:
-            self._motion_stopped_callback()
-            self._motion_stopped_callback = None
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+
+from vivintpy.devices import VivintDevice
 from vivintpy.devices.alarm_panel import AlarmPanel
 from vivintpy.devices.camera import Camera as VivintCamera
 from vivintpy.entity import UPDATE
@@ -15,11 +18,11 @@ from homeassistant.components.button import (
     ButtonEntity,
     ButtonEntityDescription,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import VivintConfigEntry
-from .hub import VivintBaseEntity, VivintHub, has_capability
+from .hub import VivintBaseEntity, VivintHub, async_add_device_entities, has_capability
 
 REBOOT_ENTITY = ButtonEntityDescription(
     key="reboot", device_class=ButtonDeviceClass.RESTART
@@ -33,23 +36,23 @@ async def async_setup_entry(
 ) -> None:
     """Set up Vivint button platform."""
     hub: VivintHub = entry.runtime_data
-    entities = [
-        VivintButtonEntity(
-            device=alarm_panel, hub=hub, entity_description=REBOOT_ENTITY
-        )
-        for system in hub.account.systems
-        if system.is_admin
-        for alarm_panel in system.alarm_panels
-    ]
-    entities.extend(
-        VivintButtonEntity(device=device, hub=hub, entity_description=REBOOT_ENTITY)
-        for system in hub.account.systems
-        for alarm_panel in system.alarm_panels
-        for device in alarm_panel.devices
-        if isinstance(device, VivintCamera)
-        and has_capability(device, Category.CAMERA, Capability.REBOOT_CAMERA)
+
+    @callback
+    def async_get_entities(devices: Iterable[VivintDevice]) -> list[VivintButtonEntity]:
+        """Get button entities for the given devices."""
+        return [
+            VivintButtonEntity(device=device, hub=hub, entity_description=REBOOT_ENTITY)
+            for device in devices
+            if (isinstance(device, AlarmPanel) and device.system.is_admin)
+            or (
+                isinstance(device, VivintCamera)
+                and has_capability(device, Category.CAMERA, Capability.REBOOT_CAMERA)
+            )
+        ]
+
+    entry.async_on_unload(
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
     )
-    async_add_entities(entities)
 
 
 class VivintButtonEntity(VivintBaseEntity, ButtonEntity):
@@ -57,6 +60,10 @@ class VivintButtonEntity(VivintBaseEntity, ButtonEntity):
 
     device: AlarmPanel | VivintCamera
 
+    def _get_state_snapshot(self) -> tuple:
+        """Return an empty snapshot, only the availability of a button changes."""
+        return ()
+
     @property
     def available(self) -> bool:
         """Return if entity is available."""
@@ -75,7 +82,7 @@ class VivintButtonEntity(VivintBaseEntity, ButtonEntity):
         await super().async_added_to_hass()
         if isinstance(self.device, AlarmPanel):
             self.async_on_remove(
-                self.device._AlarmPanel__panel.on(
-                    UPDATE, lambda _: self.async_write_ha_state()
+                self.hub.async_subscribe(
+                    self.device._AlarmPanel__panel, UPDATE, self._async_device_updated
                 )
             )
@@ -2,31 +2,66 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterable
 import logging
+from time import monotonic
+from typing import Any
 
-from vivintpy.devices.camera import Camera as VivintCamera
+from aiohttp import ClientResponseError
+from aiohttp.client_exceptions import ClientConnectorError
+from vivintpy.devices import VivintDevice
+from vivintpy.devices.camera import (
+    DOORBELL_DING,
+    MOTION_DETECTED,
+    Camera as VivintCamera,
+)
+from vivintpy.exceptions import VivintSkyApiError
+import voluptuous as vol
 
-from homeassistant.components.camera import Camera, CameraEntityFeature
+from homeassistant.components.camera import Camera, CameraEntityFeature, Image
+from homeassistant.components.camera.img_util import scale_jpeg_camera_image
 from homeassistant.components.ffmpeg import async_get_image
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_DURATION, CONF_FILENAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, format_mac
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import VivintConfigEntry
 from .const import (
     CONF_HD_STREAM,
+    CONF_PREROLL_CAMERAS,
+    CONF_PREROLL_SECONDS,
     CONF_RTSP_STREAM,
     CONF_RTSP_URL_LOGGING,
+    CONF_SNAPSHOT_INTERVAL,
     DEFAULT_HD_STREAM,
+    DEFAULT_PREROLL_SECONDS,
     DEFAULT_RTSP_STREAM,
     DEFAULT_RTSP_URL_LOGGING,
+    DEFAULT_SNAPSHOT_INTERVAL,
+    DOMAIN,
     RTSP_STREAM_DIRECT,
     RTSP_STREAM_INTERNAL,
+    STREAM_QUALITY_AUTO,
+    STREAM_QUALITY_HD,
 )
-from .hub import VivintEntity, VivintHub
+from .hub import VivintEntity, VivintHub, async_add_device_entities
+from .preroll import PrerollBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
+SERVICE_SAVE_CLIP = "save_clip"
+SERVICE_SAVE_CLIP_SCHEMA = {
+    vol.Required(CONF_FILENAME): cv.string,
+    vol.Optional(CONF_DURATION, default=10): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=60)
+    ),
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -34,48 +69,63 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Vivint cameras using config entry."""
-    entities = []
     hub: VivintHub = entry.runtime_data
 
-    hd_stream = entry.options.get(CONF_HD_STREAM, DEFAULT_HD_STREAM)
-    rtsp_stream = entry.options.get(CONF_RTSP_STREAM, DEFAULT_RTSP_STREAM)
-    rtsp_url_logging = entry.options.get(
-        CONF_RTSP_URL_LOGGING, DEFAULT_RTSP_URL_LOGGING
-    )
+    @callback
+    def async_get_entities(devices: Iterable[VivintDevice]) -> list[VivintCameraEntity]:
+        """Get camera entities for the given devices."""
+        entities = [
+            VivintCameraEntity(
+                device=device,
+                hub=hub,
+                hd_stream=hub.options.get(CONF_HD_STREAM, DEFAULT_HD_STREAM),
+                rtsp_stream=hub.options.get(CONF_RTSP_STREAM, DEFAULT_RTSP_STREAM),
+            )
+            for device in devices
+            if isinstance(device, VivintCamera)
+        ]
 
-    for system in hub.account.systems:
-        for alarm_panel in system.alarm_panels:
-            for device in alarm_panel.devices:
-                if isinstance(device, VivintCamera):
-                    if rtsp_url_logging:
-                        await log_rtsp_urls(device)
-
-                    entities.append(
-                        VivintCameraEntity(
-                            device=device,
-                            hub=hub,
-                            hd_stream=hd_stream,
-                            rtsp_stream=rtsp_stream,
-                        )
-                    )
-
-    if not entities:
-        return
+        if hub.options.get(CONF_RTSP_URL_LOGGING, DEFAULT_RTSP_URL_LOGGING):
+            for entity in entities:
+                entry.async_create_background_task(
+                    hass,
+                    log_rtsp_urls(entity.device),
+                    f"{DOMAIN}_log_rtsp_urls_{entity.device.id}",
+                )
+
+        return entities
 
-    async_add_entities(entities)
+    entry.async_on_unload(
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
+    )
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SAVE_CLIP, SERVICE_SAVE_CLIP_SCHEMA, "async_save_clip"
+    )
 
 
 async def log_rtsp_urls(device: VivintCamera) -> None:
     """Logs the rtsp urls of a Vivint camera."""
+    try:
+        # fetch the panel credentials once so the urls below can be built concurrently
+        await device.alarm_panel.get_panel_credentials()
+        urls = await asyncio.gather(
+            device.get_direct_rtsp_url(hd=True),
+            device.get_direct_rtsp_url(hd=False),
+            device.get_rtsp_url(internal=True, hd=True),
+            device.get_rtsp_url(internal=True, hd=False),
+            device.get_rtsp_url(internal=False, hd=True),
+            device.get_rtsp_url(internal=False, hd=False),
+        )
+    except (VivintSkyApiError, ClientResponseError, ClientConnectorError) as ex:
+        _LOGGER.warning("Unable to get rtsp urls for %s: %s", device.name, ex)
+        return
+
     _LOGGER.info(
         "%s rtsp urls:\n  direct hd: %s\n  direct sd: %s\n  internal hd: %s\n  internal sd: %s\n  external hd: %s\n  external sd: %s",
         device.name,
-        await device.get_direct_rtsp_url(hd=True),
-        await device.get_direct_rtsp_url(hd=False),
-        await device.get_rtsp_url(internal=True, hd=True),
-        await device.get_rtsp_url(internal=True, hd=False),
-        await device.get_rtsp_url(internal=False, hd=True),
-        await device.get_rtsp_url(internal=False, hd=False),
+        *urls,
     )
 
 
@@ -103,35 +153,241 @@ class VivintCameraEntity(VivintEntity, Camera):
 
         self.__hd_stream = hd_stream
         self.__rtsp_stream = rtsp_stream
+        self.__rtsp_url_logging = hub.options.get(
+            CONF_RTSP_URL_LOGGING, DEFAULT_RTSP_URL_LOGGING
+        )
+        # Length of a capture cycle. Image requests within the same cycle are served
+        # from a single source frame instead of decoding the stream again.
+        self.__snapshot_interval = hub.options.get(
+            CONF_SNAPSHOT_INTERVAL, DEFAULT_SNAPSHOT_INTERVAL
+        )
+        self.__last_image: bytes | None = None
+        self.__last_image_time: float | None = None
+        self.__image_lock = asyncio.Lock()
+        self.__image_variants: dict[tuple[int, int], bytes] = {}
+        self.__preroll: PrerollBuffer | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Register callbacks."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self.hub.options_signal, self._async_options_updated
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self.hub.stream_quality_signal,
+                self._async_stream_quality_updated,
+            )
+        )
+        for event_name in (MOTION_DETECTED, DOORBELL_DING):
+            self.async_on_remove(
+                self.hub.async_subscribe(
+                    self.device, event_name, self._async_invalidate_image
+                )
+            )
+        await self._async_update_preroll(self.hub.options)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop the pre-roll buffer."""
+        await super().async_will_remove_from_hass()
+        if self.__preroll:
+            await self.__preroll.async_stop()
+            self.__preroll = None
+
+    def _get_state_snapshot(self) -> tuple[bool, bool]:
+        """Return the device state the camera renders.
+
+        Other device updates, such as a changed battery level, leave the camera
+        state, and with it the entity picture, untouched.
+        """
+        return (self.device.is_online, self.device.is_in_privacy_mode)
+
+    def _is_reachable(self) -> bool:
+        """Return `True` if the camera is online and not in privacy mode."""
+        return self.device.is_online and not self.device.is_in_privacy_mode
+
+    @callback
+    def _async_device_updated(self, data: dict) -> None:
+        """Capture a new image once the camera's online or privacy state changes.
+
+        Frames captured before the camera went into privacy mode are dropped.
+        """
+        if self._get_state_snapshot() != self._state_snapshot:
+            self.__last_image_time = None
+            if self.device.is_in_privacy_mode:
+                self._async_drop_image()
+            self.hass.async_create_background_task(
+                self._async_reachability_changed(),
+                f"{DOMAIN}_camera_reachability_{self.device.id}",
+            )
+        super()._async_device_updated(data)
+
+    async def _async_reachability_changed(self) -> None:
+        """Stop or resume streaming when the camera goes away or comes back."""
+        if not self._is_reachable():
+            if self.__preroll:
+                await self.__preroll.async_stop()
+            if self.stream:
+                await self.stream.stop()
+            return
+        if self.__preroll:
+            self.__preroll.async_start()
+        if self.stream and (source := await self.stream_source()):
+            self.stream.update_source(source)
+
+    @callback
+    def _async_drop_image(self) -> None:
+        """Drop the cached frame and its resized variants."""
         self.__last_image = None
+        self.__image_variants.clear()
+
+    @callback
+    def _async_invalidate_image(self, _: dict) -> None:
+        """Capture a new image on the next request after motion or a doorbell ding."""
+        self.__last_image_time = None
+
+    async def _async_options_updated(self, options: dict[str, Any]) -> None:
+        """Apply changed stream options to the camera."""
+        self.__snapshot_interval = options.get(
+            CONF_SNAPSHOT_INTERVAL, DEFAULT_SNAPSHOT_INTERVAL
+        )
+        hd_stream = options.get(CONF_HD_STREAM, DEFAULT_HD_STREAM)
+        rtsp_stream = options.get(CONF_RTSP_STREAM, DEFAULT_RTSP_STREAM)
+        if (hd_stream, rtsp_stream) != (self.__hd_stream, self.__rtsp_stream):
+            self.__hd_stream = hd_stream
+            self.__rtsp_stream = rtsp_stream
+            await self._async_stream_source_changed()
+        await self._async_update_preroll(options)
+
+        rtsp_url_logging = options.get(CONF_RTSP_URL_LOGGING, DEFAULT_RTSP_URL_LOGGING)
+        if rtsp_url_logging and not self.__rtsp_url_logging:
+            self.platform.config_entry.async_create_background_task(
+                self.hass,
+                log_rtsp_urls(self.device),
+                f"{DOMAIN}_log_rtsp_urls_{self.device.id}",
+            )
+        self.__rtsp_url_logging = rtsp_url_logging
+
+    async def _async_stream_quality_updated(self, device: VivintDevice) -> None:
+        """Switch streams after the stream quality of the camera was selected."""
+        if device is self.device:
+            await self._async_stream_source_changed()
+
+    async def _async_stream_source_changed(self) -> None:
+        """Drop cached frames and move the stream and pre-roll to the new source."""
+        self.__last_image_time = None
+        self.__image_variants.clear()
+        if self.stream and (source := await self.stream_source()):
+            self.stream.update_source(source)
+        if self.__preroll:
+            await self.__preroll.async_restart()
 
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
-        return f"{self.device.alarm_panel.id}-{self.device.id}"
+    async def _async_update_preroll(self, options: dict[str, Any]) -> None:
+        """Start, stop or resize the pre-roll buffer as configured."""
+        if self.entity_id not in options.get(CONF_PREROLL_CAMERAS, []):
+            if self.__preroll:
+                await self.__preroll.async_stop()
+                self.__preroll = None
+            return
+        seconds = options.get(CONF_PREROLL_SECONDS, DEFAULT_PREROLL_SECONDS)
+        if self.__preroll is None:
+            self.__preroll = PrerollBuffer(
+                self.hass, self.entity_id, self.stream_source, seconds
+            )
+            if self._is_reachable():
+                self.__preroll.async_start()
+        self.__preroll.seconds = seconds
+
+    async def async_save_clip(self, filename: str, duration: float) -> None:
+        """Save the buffered video and the next `duration` seconds to a file."""
+        if not self.hass.config.is_allowed_path(filename):
+            raise HomeAssistantError(
+                f"Cannot write `{filename}`, no access to path; "
+                "`allowlist_external_dirs` may need to be adjusted in "
+                "`configuration.yaml`"
+            )
+        if not self.__preroll:
+            raise HomeAssistantError(
+                f"Pre-roll buffering is not enabled for {self.entity_id}"
+            )
+        if not self.__preroll.running:
+            raise HomeAssistantError(f"{self.entity_id} is offline or in privacy mode")
+        await self.__preroll.async_save_clip(filename, duration)
+
+    def use_hd_stream(self, snapshot: bool = False) -> bool:
+        """Return `True` if the HD stream should be used.
+
+        With automatic stream quality, snapshots use the SD stream and only live
+        viewing uses the HD stream (if enabled).
+        """
+        quality = self.hub.camera_stream_quality.get(self.device, STREAM_QUALITY_AUTO)
+        if quality == STREAM_QUALITY_AUTO:
+            return self.__hd_stream and not snapshot
+        return quality == STREAM_QUALITY_HD
 
     async def stream_source(self) -> str | None:
-        """Return the source of the stream."""
+        """Return the source of the stream, unless the camera can't stream."""
+        if not self._is_reachable():
+            return None
+        return await self._async_get_rtsp_url(hd=self.use_hd_stream())
+
+    async def _async_get_rtsp_url(self, hd: bool) -> str | None:
+        """Return the rtsp url of the configured stream type."""
         await self.device.alarm_panel.get_panel_credentials()
-        url = self.device.get_rtsp_access_url(self.__rtsp_stream, self.__hd_stream)
+        url = self.device.get_rtsp_access_url(self.__rtsp_stream, hd)
         if not url and self.__rtsp_stream == RTSP_STREAM_DIRECT:
-            url = self.device.get_rtsp_access_url(
-                RTSP_STREAM_INTERNAL, self.__hd_stream
-            )
+            url = self.device.get_rtsp_access_url(RTSP_STREAM_INTERNAL, hd)
         return url
 
     async def async_camera_image(
         self, width: int | None = None, height: int | None = None
     ) -> bytes | None:
-        """Return a frame from the camera stream."""
+        """Return a frame from the camera stream.
+
+        A full size frame is captured at most once per capture cycle and resized
+        variants are derived from it, so differently sized requests share one decode
+        of the stream. Cameras that are offline or in privacy mode return no frame
+        right away instead of waiting for the stream to time out.
+        """
+        if not self._is_reachable():
+            return None
+        async with self.__image_lock:
+            if (
+                self.__last_image_time is None
+                or monotonic() - self.__last_image_time >= self.__snapshot_interval
+            ):
+                await self._async_capture_image()
+
+            if self.__last_image is None or width is None or height is None:
+                return self.__last_image
+
+            if (image := self.__image_variants.get((width, height))) is None:
+                image = await self.hass.async_add_executor_job(
+                    scale_jpeg_camera_image,
+                    Image(self.content_type, self.__last_image),
+                    width,
+                    height,
+                )
+                self.__image_variants[(width, height)] = image
+            return image
+
+    async def _async_capture_image(self) -> None:
+        """Capture a full size frame from the camera stream."""
+        self.__last_image_time = monotonic()
         try:
-            self.__last_image = await async_get_image(
+            image = await async_get_image(
                 hass=self.hass,
-                input_source=await self.stream_source(),
-                width=width,
-                height=height,
+                input_source=await self._async_get_rtsp_url(
+                    hd=self.use_hd_stream(snapshot=True)
+                ),
             )
         except:  # pylint:disable=bare-except
             _LOGGER.debug("Could not retrieve latest image for %s", self.name)
+            return
 
-        return self.__last_image
+        if image:
+            self.__last_image = image
+            self.__image_variants.clear()
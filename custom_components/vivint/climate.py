@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Any
+from collections.abc import Iterable
+from typing import Any, NamedTuple
 
 from vivintpy.const import ThermostatAttribute
+from vivintpy.devices import VivintDevice
 from vivintpy.devices.thermostat import Thermostat
 from vivintpy.enums import (
     CapabilityCategoryType,
@@ -25,11 +27,11 @@ from homeassistant.components.climate import (
     HVACMode,
 )
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import VivintConfigEntry
-from .hub import VivintEntity, VivintHub
+from .hub import VivintEntity, VivintHub, async_add_device_entities
 
 # Map Vivint HVAC Mode to Home Assistant value
 VIVINT_HVAC_MODE_MAP = {
@@ -98,19 +100,35 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Vivint climate using config entry."""
-    entities = []
     hub: VivintHub = entry.runtime_data
 
-    for system in hub.account.systems:
-        for alarm_panel in system.alarm_panels:
-            for device in alarm_panel.devices:
-                if isinstance(device, Thermostat):
-                    entities.append(VivintClimate(device=device, hub=hub))
+    @callback
+    def async_get_entities(devices: Iterable[VivintDevice]) -> list[VivintClimate]:
+        """Get climate entities for the given devices."""
+        return [
+            VivintClimate(device=device, hub=hub)
+            for device in devices
+            if isinstance(device, Thermostat)
+        ]
+
+    entry.async_on_unload(
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
+    )
+
 
-    if not entities:
-        return
+class ThermostatState(NamedTuple):
+    """State of a Vivint thermostat."""
 
-    async_add_entities(entities)
+    hvac_mode: HVACMode
+    hvac_action: HVACAction
+    fan_mode: str
+    current_temperature: float | None
+    current_humidity: int | None
+    target_temperature: float | None
+    target_temperature_high: float | None
+    target_temperature_low: float | None
+    max_temp: float | None
+    min_temp: float | None
 
 
 class VivintClimate(VivintEntity, ClimateEntity):
@@ -128,6 +146,7 @@ class VivintClimate(VivintEntity, ClimateEntity):
     )
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
     _enable_turn_on_off_backwards_compatibility = False
+    _state_snapshot: ThermostatState
 
     def __init__(self, device: Thermostat, hub: VivintHub) -> None:
         """Pass coordinator to CoordinatorEntity."""
@@ -140,68 +159,80 @@ class VivintClimate(VivintEntity, ClimateEntity):
             if x in VIVINT_CAPABILITY_FAN_MODE_MAP
         ]
 
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
-        return f"{self.device.alarm_panel.id}-{self.device.id}"
+    def _get_state_snapshot(self) -> ThermostatState:
+        """Return the state of the thermostat."""
+        device = self.device
+        hvac_mode = VIVINT_HVAC_MODE_MAP.get(device.operating_mode, HVACMode.HEAT_COOL)
+        target_temperature = None
+        if hvac_mode == HVACMode.HEAT:
+            target_temperature = device.heat_set_point
+        elif hvac_mode == HVACMode.COOL:
+            target_temperature = device.cool_set_point
+        heat_cool = hvac_mode == HVACMode.HEAT_COOL
+        return ThermostatState(
+            hvac_mode=hvac_mode,
+            hvac_action=VIVINT_HVAC_STATUS_MAP.get(
+                device.operating_mode, HVACAction.IDLE
+            ),
+            fan_mode=VIVINT_FAN_MODE_MAP.get(device.fan_mode, FAN_ON),
+            current_temperature=device.temperature,
+            current_humidity=device.humidity,
+            target_temperature=target_temperature,
+            target_temperature_high=device.cool_set_point if heat_cool else None,
+            target_temperature_low=device.heat_set_point if heat_cool else None,
+            max_temp=device.maximum_temperature,
+            min_temp=device.minimum_temperature,
+        )
 
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
-        return self.device.temperature
+        return self._state_snapshot.current_temperature
 
     @property
     def current_humidity(self) -> int | None:
         """Return the current humidity level."""
-        return self.device.humidity
+        return self._state_snapshot.current_humidity
 
     @property
     def target_temperature(self) -> float | None:
         """Return the temperature we try to reach."""
-        if self.hvac_mode == HVACMode.HEAT:
-            return self.device.heat_set_point
-        if self.hvac_mode == HVACMode.COOL:
-            return self.device.cool_set_point
-        return None
+        return self._state_snapshot.target_temperature
 
     @property
     def target_temperature_high(self) -> float | None:
         """Return the highbound target temperature we try to reach."""
-        return (
-            None if self.hvac_mode != HVACMode.HEAT_COOL else self.device.cool_set_point
-        )
+        return self._state_snapshot.target_temperature_high
 
     @property
     def target_temperature_low(self) -> float | None:
         """Return the lowbound target temperature we try to reach."""
-        return (
-            None if self.hvac_mode != HVACMode.HEAT_COOL else self.device.heat_set_point
-        )
+        return self._state_snapshot.target_temperature_low
 
     @property
     def max_temp(self) -> float | None:
         """Return the maximum temperature."""
-        return self.device.maximum_temperature
+        return self._state_snapshot.max_temp
 
     @property
     def min_temp(self) -> float | None:
         """Return the minimum temperature."""
-        return self.device.minimum_temperature
+        return self._state_snapshot.min_temp
 
     @property
     def hvac_mode(self) -> HVACMode:
         """Return hvac operation ie. heat, cool mode."""
-        return VIVINT_HVAC_MODE_MAP.get(self.device.operating_mode, HVACMode.HEAT_COOL)
+        return self._state_snapshot.hvac_mode
 
     @property
     def hvac_action(self) -> HVACAction:
         """Return the current running hvac operation if supported."""
-        return VIVINT_HVAC_STATUS_MAP.get(self.device.operating_mode, HVACAction.IDLE)
+        return self._state_snapshot.hvac_action
 
     @property
     def fan_mode(self) -> str:
         """Return the fan mode."""
-        return VIVINT_FAN_MODE_MAP.get(self.device.fan_mode, FAN_ON)
+        return self._state_snapshot.fan_mode
 
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set new target fan mode."""
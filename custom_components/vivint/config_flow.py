@@ -18,7 +18,7 @@ from homeassistant.config_entries import ConfigEntry, ConfigFlow
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import config_validation as cv, selector
 from homeassistant.helpers.schema_config_entry_flow import (
     SchemaCommonFlowHandler,
     SchemaFlowError,
@@ -28,18 +28,26 @@ from homeassistant.helpers.schema_config_entry_flow import (
 
 from .const import (
     CONF_DISARM_CODE,
+    CONF_EVENT_LOG,
     CONF_HD_STREAM,
     CONF_MFA,
+    CONF_PREROLL_CAMERAS,
+    CONF_PREROLL_SECONDS,
     CONF_REFRESH_TOKEN,
     CONF_RTSP_STREAM,
     CONF_RTSP_URL_LOGGING,
+    CONF_SNAPSHOT_INTERVAL,
+    DEFAULT_EVENT_LOG,
     DEFAULT_HD_STREAM,
+    DEFAULT_PREROLL_SECONDS,
     DEFAULT_RTSP_STREAM,
     DEFAULT_RTSP_URL_LOGGING,
+    DEFAULT_SNAPSHOT_INTERVAL,
     DOMAIN,
     RTSP_STREAM_TYPES,
 )
 from .hub import VivintHub
+from .manager import async_get_manager
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -68,6 +76,32 @@ OPTIONS_SCHEMA = vol.Schema(
             RTSP_STREAM_TYPES
         ),
         vol.Optional(CONF_RTSP_URL_LOGGING, default=DEFAULT_RTSP_URL_LOGGING): bool,
+        vol.Optional(
+            CONF_SNAPSHOT_INTERVAL, default=DEFAULT_SNAPSHOT_INTERVAL
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=5,
+                max=3600,
+                unit_of_measurement="s",
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        ),
+        vol.Optional(CONF_EVENT_LOG, default=DEFAULT_EVENT_LOG): bool,
+        vol.Optional(CONF_PREROLL_CAMERAS, default=[]): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain="camera", integration=DOMAIN, multiple=True
+            )
+        ),
+        vol.Optional(
+            CONF_PREROLL_SECONDS, default=DEFAULT_PREROLL_SECONDS
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=2,
+                max=30,
+                unit_of_measurement="s",
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        ),
     }
 )
 OPTIONS_FLOW = {
@@ -96,7 +130,11 @@ class VivintConfigFlow(ConfigFlow, domain=DOMAIN):
             CONF_REFRESH_TOKEN: self._hub.account.refresh_token,
         }
 
-        await self._hub.disconnect()
+        # hand the authenticated hub to the entry so it doesn't have to login again
+        async_get_manager(self.hass).async_hand_off_hub(
+            config_data[CONF_USERNAME], self._hub
+        )
+        self._hub = None
         if existing_entry:
             self.hass.config_entries.async_update_entry(
                 existing_entry, data=config_data
@@ -114,9 +152,12 @@ class VivintConfigFlow(ConfigFlow, domain=DOMAIN):
         """Attempt a login with Vivint."""
         errors = {}
 
+        if self._hub:
+            await self._hub.disconnect()
         self._hub = VivintHub(self.hass, user_input)
         try:
-            await self._hub.login(load_devices=True)
+            # only validate the credentials, the entry loads the devices itself
+            await self._hub.login(load_devices=False)
         except VivintSkyApiMfaRequiredError:
             return await self.async_step_mfa()
         except VivintSkyApiAuthenticationError:
@@ -199,6 +240,15 @@ class VivintConfigFlow(ConfigFlow, domain=DOMAIN):
             schema=STEP_USER_DATA_SCHEMA,
         )
 
+    @callback
+    def async_remove(self) -> None:
+        """Disconnect the hub of an abandoned flow."""
+        if self._hub:
+            self.hass.async_create_background_task(
+                self._hub.disconnect(), f"{DOMAIN}_config_flow_disconnect"
+            )
+            self._hub = None
+
     @staticmethod
     @callback
     def async_get_options_flow(entry: ConfigEntry) -> SchemaOptionsFlowHandler:
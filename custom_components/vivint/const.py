@@ -12,12 +12,24 @@ RTSP_STREAM_TYPES = {
     RTSP_STREAM_EXTERNAL: "External",
 }
 
+STREAM_QUALITY_AUTO = "auto"
+STREAM_QUALITY_HD = "hd"
+STREAM_QUALITY_SD = "sd"
+STREAM_QUALITIES = [STREAM_QUALITY_AUTO, STREAM_QUALITY_HD, STREAM_QUALITY_SD]
+
 CONF_MFA = "code"
 CONF_REFRESH_TOKEN = "refresh_token"
 CONF_DISARM_CODE = "disarm_code"
+CONF_EVENT_LOG = "event_log"
 CONF_HD_STREAM = "hd_stream"
+CONF_PREROLL_CAMERAS = "preroll_cameras"
+CONF_PREROLL_SECONDS = "preroll_seconds"
 CONF_RTSP_STREAM = "rtsp_stream"
 CONF_RTSP_URL_LOGGING = "rtsp_url_logging"
+CONF_SNAPSHOT_INTERVAL = "snapshot_interval"
+DEFAULT_EVENT_LOG = False
 DEFAULT_HD_STREAM = True
+DEFAULT_PREROLL_SECONDS = 10
 DEFAULT_RTSP_STREAM = RTSP_STREAM_DIRECT
 DEFAULT_RTSP_URL_LOGGING = False
+DEFAULT_SNAPSHOT_INTERVAL = 10
@@ -1,7 +1,9 @@
 """Support for Vivint garage doors."""
 
+from collections.abc import Iterable
 from typing import Any
 
+from vivintpy.devices import VivintDevice
 from vivintpy.devices.garage_door import GarageDoor
 
 from homeassistant.components.cover import (
@@ -9,11 +11,11 @@ from homeassistant.components.cover import (
     CoverEntity,
     CoverEntityFeature,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import VivintConfigEntry
-from .hub import VivintEntity, VivintHub
+from .hub import VivintEntity, VivintHub, async_add_device_entities
 
 
 async def async_setup_entry(
@@ -22,19 +24,22 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Vivint garage doors using config entry."""
-    entities = []
     hub: VivintHub = entry.runtime_data
 
-    for system in hub.account.systems:
-        for alarm_panel in system.alarm_panels:
-            for device in alarm_panel.devices:
-                if isinstance(device, GarageDoor):
-                    entities.append(VivintGarageDoorEntity(device=device, hub=hub))
+    @callback
+    def async_get_entities(
+        devices: Iterable[VivintDevice],
+    ) -> list[VivintGarageDoorEntity]:
+        """Get garage door entities for the given devices."""
+        return [
+            VivintGarageDoorEntity(device=device, hub=hub)
+            for device in devices
+            if isinstance(device, GarageDoor)
+        ]
 
-    if not entities:
-        return
-
-    async_add_entities(entities)
+    entry.async_on_unload(
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
+    )
 
 
 class VivintGarageDoorEntity(VivintEntity, CoverEntity):
@@ -45,6 +50,10 @@ class VivintGarageDoorEntity(VivintEntity, CoverEntity):
     _attr_device_class = CoverDeviceClass.GARAGE
     _attr_supported_features = CoverEntityFeature.CLOSE | CoverEntityFeature.OPEN
 
+    def _get_state_snapshot(self) -> tuple[bool, bool, bool]:
+        """Return the movement and position of the garage door."""
+        return (self.device.is_opening, self.device.is_closing, self.device.is_closed)
+
     @property
     def is_opening(self) -> bool:
         """Return whether this device is opening."""
@@ -60,11 +69,6 @@ class VivintGarageDoorEntity(VivintEntity, CoverEntity):
         """Return whether this device is closed."""
         return self.device.is_closed
 
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
-        return f"{self.device.alarm_panel.id}-{self.device.id}"
-
     async def async_close_cover(self, **kwargs: Any) -> None:
         """Close cover."""
         await self.device.close()
@@ -10,16 +10,22 @@ from vivintpy.enums import CapabilityCategoryType
 import voluptuous as vol
 
 from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
-from homeassistant.components.homeassistant.triggers import event as event_trigger
 from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
-from homeassistant.core import CALLBACK_TYPE, HomeAssistant
-from homeassistant.helpers import config_entry_flow, device_registry as dr
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Context,
+    Event,
+    HassJob,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
 from homeassistant.helpers.typing import ConfigType
 
 from . import VivintConfigEntry
 from .const import DOMAIN, EVENT_TYPE
-from .hub import VivintHub
+from .hub import VivintHub, async_get_device_trigger_index
 
 TRIGGER_TYPES = {MOTION_DETECTED, DOORBELL_DING}
 
@@ -96,16 +102,30 @@ async def async_attach_trigger(
     automation_info: TriggerInfo,
 ) -> CALLBACK_TYPE:
     """Attach a trigger."""
-    event_config = event_trigger.TRIGGER_SCHEMA(
-        {
-            event_trigger.CONF_PLATFORM: "event",
-            event_trigger.CONF_EVENT_TYPE: EVENT_TYPE,
-            event_trigger.CONF_EVENT_DATA: {
-                CONF_DEVICE_ID: config[CONF_DEVICE_ID],
-                CONF_TYPE: config[CONF_TYPE],
+    device_id = config[CONF_DEVICE_ID]
+    trigger_type = config[CONF_TYPE]
+    trigger_data = automation_info["trigger_data"]
+    job = HassJob(action, f"vivint device trigger {trigger_type}")
+
+    @callback
+    def async_handle_event(event_data: dict, context: Context) -> None:
+        """Run the automation action for a matching Vivint event."""
+        hass.async_run_hass_job(
+            job,
+            {
+                "trigger": {
+                    **trigger_data,
+                    CONF_PLATFORM: "device",
+                    CONF_DOMAIN: DOMAIN,
+                    CONF_DEVICE_ID: device_id,
+                    CONF_TYPE: trigger_type,
+                    "event": Event(EVENT_TYPE, event_data, context=context),
+                    "description": f"{EVENT_TYPE} event",
+                }
             },
-        }
-    )
-    return await event_trigger.async_attach_trigger(
-        hass, event_config, action, automation_info, platform_type="device"
+            context,
+        )
+
+    return async_get_device_trigger_index(hass).async_attach(
+        device_id, trigger_type, async_handle_event
     )
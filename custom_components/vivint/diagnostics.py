@@ -0,0 +1,46 @@
+"""Diagnostics support for Vivint."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from . import VivintConfigEntry
+from .const import CONF_DISARM_CODE, CONF_REFRESH_TOKEN
+from .hub import VivintHub, async_get_device_trigger_index
+
+TO_REDACT = {CONF_DISARM_CODE, CONF_PASSWORD, CONF_REFRESH_TOKEN, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: VivintConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    hub: VivintHub = entry.runtime_data
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "systems": {
+            "loaded": len(hub.account.systems),
+            "pending": len(hub.pending_systems),
+            "failed": len(hub.failed_systems),
+        },
+        "refresh": hub.refresh_stats.diagnostics,
+        "listeners": hub.listener_counts,
+        "state_writes": {
+            "written": dict(hub.state_writes),
+            "suppressed": dict(hub.suppressed_writes),
+        },
+        "manager": hub.manager.diagnostics,
+        "realtime": hub.realtime.diagnostics,
+        "device_triggers": len(async_get_device_trigger_index(hass)),
+        "timeline": {
+            "events": len(hub.timeline),
+            "log_enabled": hub.timeline.log_path is not None,
+        },
+    }
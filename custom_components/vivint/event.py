@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 import logging
 
+from vivintpy.devices import VivintDevice
 from vivintpy.devices.camera import DOORBELL_DING, Camera
 from vivintpy.enums import CapabilityCategoryType
 
@@ -16,7 +18,7 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import VivintConfigEntry
-from .hub import VivintBaseEntity, VivintHub
+from .hub import VivintBaseEntity, VivintHub, async_add_device_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,30 +37,32 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Vivint events using config entry."""
-    entities = []
     hub: VivintHub = entry.runtime_data
 
-    for system in hub.account.systems:
-        for alarm_panel in system.alarm_panels:
-            for device in alarm_panel.get_devices([Camera]):
-                if CapabilityCategoryType.DOORBELL in device.capabilities:
-                    entities.append(
-                        VivintEventEntity(
-                            device=device,
-                            hub=hub,
-                            entity_description=DOORBELL_DESCRIPTION,
-                        )
-                    )
-
-    if not entities:
-        return
-
-    async_add_entities(entities)
+    @callback
+    def async_get_entities(devices: Iterable[VivintDevice]) -> list[VivintEventEntity]:
+        """Get event entities for the given devices."""
+        return [
+            VivintEventEntity(
+                device=device, hub=hub, entity_description=DOORBELL_DESCRIPTION
+            )
+            for device in devices
+            if isinstance(device, Camera)
+            and CapabilityCategoryType.DOORBELL in device.capabilities
+        ]
+
+    entry.async_on_unload(
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
+    )
 
 
 class VivintEventEntity(VivintBaseEntity, EventEntity):
     """Vivint event entity."""
 
+    def _get_state_snapshot(self) -> tuple:
+        """Return an empty snapshot, events are not part of the device state."""
+        return ()
+
     @callback
     def _async_handle_event(self, *args, **kwargs) -> None:
         """Handle the event."""
@@ -69,5 +73,7 @@ class VivintEventEntity(VivintBaseEntity, EventEntity):
         """Register callbacks."""
         await super().async_added_to_hass()
         self.async_on_remove(
-            self.device.on(self.event_types[0], self._async_handle_event)
+            self.hub.async_subscribe(
+                self.device, self.event_types[0], self._async_handle_event
+            )
         )
@@ -0,0 +1,214 @@
+"""Firmware update checks shared by all Vivint alarm panels."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from time import monotonic
+from typing import Any
+
+from aiohttp import ClientResponseError
+from aiohttp.client_exceptions import ClientConnectorError
+from vivintpy.const import VivintDeviceAttribute
+from vivintpy.devices import VivintDevice
+from vivintpy.devices.alarm_panel import AlarmPanel
+from vivintpy.enums import DeviceType
+from vivintpy.exceptions import VivintSkyApiError
+from vivintpy.system import System
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+CHECK_INTERVAL = 24 * 60 * 60
+# Delay before checking a panel again after its first failed check, doubled after
+# each further failure up to the check interval
+CHECK_RETRY_SECONDS = 60
+INSTALL_DETAILS_MAX_AGE = 60 * 60
+INSTALL_POLL_SECONDS = 30
+# Time allowed for a panel to report an install as started after requesting it
+INSTALL_START_SECONDS = 5 * 60
+
+IDLE_STATUSES = ("Idle", "Reboot Pending")
+SOFTWARE_UPDATE_STATUS = "sus"
+
+
+def get_panel_device(panel: AlarmPanel) -> VivintDevice | None:
+    """Return the physical panel device of an alarm panel."""
+    return next(
+        (
+            device
+            for device in panel.devices
+            if device.data.get(VivintDeviceAttribute.TYPE) == DeviceType.PANEL.value
+        ),
+        None,
+    )
+
+
+def is_update_in_progress(panel: AlarmPanel) -> bool:
+    """Return `True` if the panel reports a software update in progress."""
+    if (device := get_panel_device(panel)) is None:
+        return False
+    return device.data.get(SOFTWARE_UPDATE_STATUS) not in IDLE_STATUSES
+
+
+type PanelKey = tuple[int, int]
+type RefreshSystem = Callable[[System], Awaitable[Any]]
+
+
+def get_panel_key(panel: AlarmPanel) -> PanelKey:
+    """Return the key of a panel that stays the same when the panel is rebuilt."""
+    return (panel.id, panel.partition_id)
+
+
+class FirmwareUpdateScheduler:
+    """Check the software update details of all admin panels from a single timer.
+
+    Panels are checked concurrently once per check interval and the details are
+    cached in between. While an install is running the panel's system is refreshed
+    every few seconds, so its progress is reported, until the panel is idle again.
+    Failed checks are retried with exponential backoff. Panels are tracked by id and
+    partition, and forgotten once their last listener unregisters, so panels of
+    unloaded entries are not kept alive.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the firmware update scheduler."""
+        self._hass = hass
+        self._panels: dict[PanelKey, tuple[AlarmPanel, RefreshSystem]] = {}
+        self._listeners: dict[PanelKey, list[Callable[[], None]]] = {}
+        self._details: dict[PanelKey, tuple[float, dict[str, bool | str]]] = {}
+        self._installing: dict[PanelKey, float] = {}
+        # time of the last failed check and the number of failures in a row
+        self._failures: dict[PanelKey, tuple[float, int]] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_register(
+        self,
+        panel: AlarmPanel,
+        update_callback: Callable[[], None],
+        refresh_system: RefreshSystem,
+    ) -> CALLBACK_TYPE:
+        """Check a panel for updates and call `update_callback` with new results.
+
+        While an install runs, the panel's system is refreshed with `refresh_system`.
+        """
+        key = get_panel_key(panel)
+        self._panels[key] = (panel, refresh_system)
+        self._listeners.setdefault(key, []).append(update_callback)
+        self._async_schedule()
+
+        @callback
+        def unregister() -> None:
+            """Forget the panel once it has no listeners."""
+            listeners = self._listeners.get(key, [])
+            if update_callback in listeners:
+                listeners.remove(update_callback)
+            if not listeners:
+                self._panels.pop(key, None)
+                self._listeners.pop(key, None)
+                self._details.pop(key, None)
+                self._installing.pop(key, None)
+                self._failures.pop(key, None)
+            self._async_schedule()
+
+        return unregister
+
+    @callback
+    def get_details(self, panel: AlarmPanel) -> dict[str, bool | str] | None:
+        """Return the cached software update details of a panel."""
+        if (cached := self._details.get(get_panel_key(panel))) is None:
+            return None
+        return cached[1]
+
+    async def async_install(self, panel: AlarmPanel) -> bool:
+        """Install an available update, using recently cached details if possible."""
+        checked, details = self._details.get(get_panel_key(panel), (None, None))
+        if checked is None or monotonic() - checked > INSTALL_DETAILS_MAX_AGE:
+            details = await self._async_fetch_details(panel)
+        if not details.get("available"):
+            return True
+        if not await panel.update_software():
+            return False
+        self.async_track_install(panel)
+        return True
+
+    @callback
+    def async_track_install(self, panel: AlarmPanel) -> None:
+        """Poll a panel more often while it installs an update."""
+        key = get_panel_key(panel)
+        if key in self._installing or key not in self._panels:
+            return
+        self._installing[key] = monotonic()
+        self._async_schedule()
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Schedule the next check for when the first panel is due."""
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if not self._panels:
+            return
+        if self._installing:
+            delay = INSTALL_POLL_SECONDS
+        else:
+            delay = max(0, min(map(self._get_due, self._panels)) - monotonic())
+        self._unsub_timer = async_call_later(self._hass, delay, self._async_run)
+
+    def _get_due(self, key: PanelKey) -> float:
+        """Return the time the next check of a panel is due."""
+        if key in self._installing:
+            return self._installing[key]
+        if (failure := self._failures.get(key)) is not None:
+            failed, failures = failure
+            return failed + min(
+                CHECK_RETRY_SECONDS * 2 ** (failures - 1), CHECK_INTERVAL
+            )
+        if (cached := self._details.get(key)) is not None:
+            return cached[0] + CHECK_INTERVAL
+        return 0
+
+    async def _async_run(self, *_) -> None:
+        """Check all panels that are due concurrently."""
+        self._unsub_timer = None
+        now = monotonic()
+        due = [key for key in self._panels if self._get_due(key) <= now]
+        await asyncio.gather(*(self._async_check(key) for key in due))
+        if not self._unsub_timer:
+            self._async_schedule()
+
+    async def _async_check(self, key: PanelKey) -> None:
+        """Check a panel and notify its listeners."""
+        if (registered := self._panels.get(key)) is None:
+            return
+        panel, refresh_system = registered
+        try:
+            if (started := self._installing.get(key)) is not None:
+                await refresh_system(panel.system)
+                if (
+                    is_update_in_progress(panel)
+                    or monotonic() - started < INSTALL_START_SECONDS
+                ):
+                    return
+                self._installing.pop(key, None)
+            await self._async_fetch_details(panel)
+            self._failures.pop(key, None)
+        except (VivintSkyApiError, ClientResponseError, ClientConnectorError) as ex:
+            _LOGGER.debug("Unable to check %s for updates: %s", panel.name, ex)
+            if key in self._panels:
+                failures = self._failures.get(key, (0, 0))[1] + 1
+                self._failures[key] = (monotonic(), failures)
+        finally:
+            for update_callback in tuple(self._listeners.get(key, ())):
+                update_callback()
+
+    async def _async_fetch_details(self, panel: AlarmPanel) -> dict[str, bool | str]:
+        """Fetch and cache the software update details of a panel."""
+        details = await panel.get_software_update_details()
+        if (key := get_panel_key(panel)) in self._panels:
+            self._details[key] = (monotonic(), details)
+        return details
@@ -3,17 +3,24 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable
-from datetime import timedelta
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Mapping
+from functools import partial
+import heapq
+from itertools import count
 import logging
+import math
+from time import perf_counter, time
+from typing import Any
 
 from aiohttp import ClientResponseError
-from aiohttp.client import ClientSession
 from aiohttp.client_exceptions import ClientConnectorError
+import jwt
 from vivintpy.account import Account
+from vivintpy.const import AuthUserAttribute, SystemAttribute, UserAttribute
 from vivintpy.devices import VivintDevice
 from vivintpy.devices.alarm_panel import AlarmPanel
-from vivintpy.entity import UPDATE
+from vivintpy.entity import UPDATE, Entity as VivintEmitter
 from vivintpy.enums import (
     CapabilityCategoryType as Category,
     CapabilityType as Capability,
@@ -24,20 +31,46 @@ from vivintpy.exceptions import (
     VivintSkyApiError,
     VivintSkyApiMfaRequiredError,
 )
+from vivintpy.system import System
 
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.entity import DeviceInfo, EntityDescription
+from homeassistant.core import CALLBACK_TYPE, Context, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
+    UpdateFailed,
 )
 
 from .const import CONF_REFRESH_TOKEN, DOMAIN
+from .manager import async_get_manager
+from .realtime import RealtimeMonitor
+from .refresh import RefreshStats, apply_system_diff, diff_system, snapshot_system
+from .timeline import EventTimeline
 
 _LOGGER = logging.getLogger(__name__)
 
-UPDATE_INTERVAL = 300
+DATA_DEVICE_TRIGGERS = f"{DOMAIN}_device_triggers"
+
+DISCOVERY_BATCH_SECONDS = 1
+# Number of systems loaded or refreshed at the same time
+SYSTEM_LOAD_LIMIT = 4
+# Time allowed for loading or refreshing a single system
+SYSTEM_TIMEOUT = 30
+SYSTEM_RETRY_SECONDS = 60
+SYSTEM_RETRY_MAX_SECONDS = 15 * 60
+# Renew the session this long before the id token expires
+TOKEN_REFRESH_MARGIN = 5 * 60
+TOKEN_RETRY_SECONDS = 60
 
 
 @callback
@@ -49,6 +82,31 @@ def get_device_id(device: VivintDevice) -> tuple[str, str]:
     )
 
 
+@callback
+def async_add_device_entities(
+    hub: VivintHub,
+    async_add_entities: AddEntitiesCallback,
+    get_entities: Callable[[Iterable[VivintDevice]], list[Entity]],
+) -> CALLBACK_TYPE:
+    """Add entities for the hub's devices and for any devices discovered later.
+
+    `get_entities` is called with the alarm panels and devices to create entities
+    for. Returns a callback to stop listening for discovered devices.
+    """
+    if entities := get_entities(hub.devices):
+        async_add_entities(entities)
+
+    @callback
+    def async_add_discovered(devices: list[VivintDevice]) -> None:
+        """Add entities for discovered devices."""
+        if entities := get_entities(devices):
+            async_add_entities(entities)
+
+    return async_dispatcher_connect(
+        hub.hass, hub.discovery_signal, async_add_discovered
+    )
+
+
 def has_capability(device: VivintDevice, category: Category, capability: Capability):
     """Check if a device has a capability."""
     if capability in (device.capabilities or {}).get(category, []):
@@ -61,32 +119,273 @@ def has_feature(device: VivintDevice, feature: Feature):
     return feature in (device.features or [])
 
 
+class DeviceTriggerIndex:
+    """Index of attached device triggers keyed by device registry id and type.
+
+    Events are delivered straight to the matching triggers, so the cost of an event
+    depends on the number of matching automations rather than all of them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the device trigger index."""
+        self._triggers: dict[
+            tuple[str, str], list[Callable[[dict, Context], None]]
+        ] = {}
+
+    def __len__(self) -> int:
+        """Return the number of attached triggers."""
+        return sum(len(actions) for actions in self._triggers.values())
+
+    @callback
+    def async_attach(
+        self,
+        device_id: str,
+        trigger_type: str,
+        action: Callable[[dict, Context], None],
+    ) -> CALLBACK_TYPE:
+        """Attach a trigger action for a device and trigger type."""
+        key = (device_id, trigger_type)
+        actions = self._triggers.setdefault(key, [])
+        actions.append(action)
+
+        @callback
+        def detach() -> None:
+            """Detach the trigger action."""
+            if action in actions:
+                actions.remove(action)
+            if not actions and self._triggers.get(key) is actions:
+                del self._triggers[key]
+
+        return detach
+
+    @callback
+    def async_fire(
+        self, device_id: str, trigger_type: str, event_data: dict, context: Context
+    ) -> None:
+        """Call the trigger actions attached to a device and trigger type.
+
+        The context of the originating event is passed on, so automation traces can
+        follow it.
+        """
+        for action in tuple(self._triggers.get((device_id, trigger_type), ())):
+            action(event_data, context)
+
+
+@callback
+def async_get_device_trigger_index(hass: HomeAssistant) -> DeviceTriggerIndex:
+    """Get the device trigger index shared by all config entries."""
+    if (index := hass.data.get(DATA_DEVICE_TRIGGERS)) is None:
+        index = hass.data[DATA_DEVICE_TRIGGERS] = DeviceTriggerIndex()
+    return index
+
+
+class ExpiryScheduler:
+    """Expire timed states, such as motion, for many entities behind a single timer.
+
+    Deadlines are rounded up to whole seconds on the loop clock so expirations that
+    fall within the same second are handled together in one timer callback.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the expiry scheduler."""
+        self._hass = hass
+        self._deadlines: dict[Hashable, tuple[float, Callable[[], None]]] = {}
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._counter = count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_deadline: float | None = None
+
+    @callback
+    def async_schedule(
+        self, key: Hashable, delay: float, action: Callable[[], None]
+    ) -> None:
+        """Schedule `action` to be called after `delay` seconds, replacing any pending expiry for `key`."""
+        deadline = float(math.ceil(self._hass.loop.time() + delay))
+        self._deadlines[key] = (deadline, action)
+        heapq.heappush(self._heap, (deadline, next(self._counter), key))
+        if self._timer_deadline is None or deadline < self._timer_deadline:
+            self._async_arm(deadline)
+
+    @callback
+    def async_cancel(self, key: Hashable) -> None:
+        """Cancel the pending expiry for `key`, if any."""
+        self._deadlines.pop(key, None)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the timer and drop all pending expirations."""
+        if self._timer:
+            self._timer.cancel()
+        self._timer = self._timer_deadline = None
+        self._deadlines.clear()
+        self._heap.clear()
+
+    @callback
+    def _async_arm(self, deadline: float) -> None:
+        """Arm the timer for the given deadline."""
+        if self._timer:
+            self._timer.cancel()
+        self._timer_deadline = deadline
+        self._timer = self._hass.loop.call_at(deadline, self._async_expire, deadline)
+
+    @callback
+    def _async_expire(self, deadline: float) -> None:
+        """Run all actions whose deadline has passed and re-arm the timer.
+
+        The timer's own deadline counts as passed, even if the loop clock is a
+        little behind when the timer runs.
+        """
+        self._timer = self._timer_deadline = None
+        now = max(self._hass.loop.time(), deadline)
+        expired: list[Callable[[], None]] = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(self._heap)
+            # skip heap entries that were rescheduled or cancelled since being pushed
+            if (pending := self._deadlines.get(key)) and pending[0] == deadline:
+                del self._deadlines[key]
+                expired.append(pending[1])
+
+        for action in expired:
+            action()
+
+        if self._heap:
+            self._async_arm(self._heap[0][0])
+
+
 class VivintHub:
     """A Vivint hub wrapper class."""
 
     def __init__(
-        self, hass: HomeAssistant, data: dict, undo_listener: Callable | None = None
+        self,
+        hass: HomeAssistant,
+        data: dict,
+        undo_listener: Callable | None = None,
+        entry_id: str | None = None,
+        options: Mapping[str, Any] | None = None,
     ) -> None:
         """Initialize the Vivint hub."""
+        self.hass = hass
+        self.entry_id = entry_id
         self._data = data
+        self.options = dict(options or {})
         self.__undo_listener = undo_listener
         self.account: Account = None
         self.logged_in = False
-        self.session = ClientSession()
+        self.manager = async_get_manager(hass)
+        self.session = self.manager.async_create_session()
         self._lock = asyncio.Lock()
-
-        async def _async_update_data() -> None:
-            """Update all device states from the Vivint API."""
-            return await self.account.refresh()
-
-        self.coordinator = DataUpdateCoordinator(
-            hass,
+        self.camera_stream_quality: dict[VivintDevice, str] = {}
+        self.motion_expiry = ExpiryScheduler(hass)
+        self.timeline = EventTimeline(hass)
+        self.realtime = RealtimeMonitor(hass, self)
+        self.refresh_stats = RefreshStats()
+        self._subscriptions: dict[
+            tuple[VivintEmitter, str], list[Callable[[dict], None]]
+        ] = {}
+        self._emitter_unsubs: dict[tuple[VivintEmitter, str], Callable[[], None]] = {}
+        self._discovered: list[VivintDevice] = []
+        # state writes of device entities by platform, see VivintDeviceEntity
+        self.state_writes: Counter[str] = Counter()
+        self.suppressed_writes: Counter[str] = Counter()
+        self._unsub_discovered: CALLBACK_TYPE | None = None
+        self._unsub_token_refresh: CALLBACK_TYPE | None = None
+        self._system_semaphore = asyncio.Semaphore(SYSTEM_LOAD_LIMIT)
+        # systems that could not be loaded yet and systems whose last refresh failed
+        self.pending_systems: dict[int, dict] = {}
+        self.failed_systems: set[int] = set()
+        self._system_retries: dict[int, int] = {}
+        self._unsub_system_retry: dict[int, CALLBACK_TYPE] = {}
+
+        self.coordinator = self._create_coordinator()
+
+    @callback
+    def _create_coordinator(
+        self, entry: ConfigEntry | UndefinedType = UNDEFINED
+    ) -> DataUpdateCoordinator[frozenset[VivintDevice]]:
+        """Create the coordinator that refreshes all systems.
+
+        Without an entry, the coordinator uses the entry being set up, if any.
+        """
+        return DataUpdateCoordinator(
+            self.hass,
             _LOGGER,
+            config_entry=entry,
             name=DOMAIN,
-            update_method=_async_update_data,
-            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            update_method=self._async_update_data,
+            # polls are scheduled by the hub manager, see async_register_poll
+            update_interval=None,
         )
 
+    @property
+    def devices(self) -> list[VivintDevice]:
+        """Return all alarm panels and their devices."""
+        return [
+            device
+            for system in self.account.systems
+            for alarm_panel in system.alarm_panels
+            for device in (alarm_panel, *alarm_panel.devices)
+        ]
+
+    @property
+    def panel_signal(self) -> str:
+        """Return the dispatcher signal for alarm panels loaded after setup."""
+        return f"{DOMAIN}_{self.entry_id}_add_panel"
+
+    @property
+    def discovery_signal(self) -> str:
+        """Return the dispatcher signal for discovered devices."""
+        return f"{DOMAIN}_{self.entry_id}_add_devices"
+
+    @property
+    def options_signal(self) -> str:
+        """Return the dispatcher signal for options applied without a reload."""
+        return f"{DOMAIN}_{self.entry_id}_options_updated"
+
+    @property
+    def stream_quality_signal(self) -> str:
+        """Return the dispatcher signal for a changed camera stream quality."""
+        return f"{DOMAIN}_{self.entry_id}_stream_quality"
+
+    @callback
+    def async_add_discovered_device(self, device: VivintDevice) -> None:
+        """Queue a discovered device so bursts are sent to the platforms together."""
+        self._discovered.append(device)
+        if not self._unsub_discovered:
+            self._unsub_discovered = async_call_later(
+                self.hass, DISCOVERY_BATCH_SECONDS, self._async_send_discovered
+            )
+
+    @callback
+    def _async_send_discovered(self, *_) -> None:
+        """Send the queued discovered devices to the platforms."""
+        self._unsub_discovered = None
+        devices, self._discovered = self._discovered, []
+        async_dispatcher_send(self.hass, self.discovery_signal, devices)
+
+    async def _async_update_data(self) -> frozenset[VivintDevice]:
+        """Update all device states from the Vivint API.
+
+        The data of the coordinator is the set of devices that changed. Their
+        entities write their state from the device updates emitted while the
+        refresh is applied, so the refresh itself only writes availability.
+        """
+        try:
+            authuser_data = await self.account.api.get_authuser_data()
+        except VivintSkyApiAuthenticationError as ex:
+            raise ConfigEntryAuthFailed(ex) from ex
+        except VivintSkyApiError as ex:
+            raise UpdateFailed(ex) from ex
+        changed = await self._async_load_systems(authuser_data, announce=True)
+        if self.account.systems and self.failed_systems.issuperset(
+            system.id for system in self.account.systems
+        ):
+            raise UpdateFailed("Unable to refresh any Vivint system")
+        # the session may have been renewed on demand by the request above
+        self.async_save_refresh_token()
+        if not self._unsub_token_refresh:
+            self._async_schedule_token_refresh()
+        return changed
+
     async def login(
         self, load_devices: bool = False, subscribe_for_realtime_updates: bool = False
     ) -> bool:
@@ -101,9 +400,14 @@ class VivintHub:
         )
         try:
             await self.account.connect(
-                load_devices=load_devices,
-                subscribe_for_realtime_updates=subscribe_for_realtime_updates,
+                subscribe_for_realtime_updates=subscribe_for_realtime_updates
             )
+            if load_devices:
+                await self._async_load_systems(
+                    await self.account.api.get_authuser_data(), announce=False
+                )
+            if subscribe_for_realtime_updates:
+                self.realtime.async_start()
             return self.save_session()
         except VivintSkyApiMfaRequiredError as ex:
             raise ex
@@ -114,21 +418,216 @@ class VivintHub:
             _LOGGER.error("Unable to connect to the Vivint API")
             raise ex
 
+    @callback
+    def async_attach_entry(
+        self, entry: ConfigEntry, undo_listener: Callable | None = None
+    ) -> None:
+        """Attach a hub authenticated by the config flow to its config entry.
+
+        The coordinator is created again, as the flow created it without an entry.
+        """
+        self.entry_id = entry.entry_id
+        self._data = entry.data
+        self.options = dict(entry.options)
+        self.__undo_listener = undo_listener
+        self.coordinator = self._create_coordinator(entry)
+        if self.logged_in:
+            self._async_schedule_token_refresh()
+
+    async def async_load(self) -> None:
+        """Load devices and subscribe for realtime updates without logging in again."""
+        authuser_data = await self.account.api.get_authuser_data()
+        await self.account.subscribe_for_realtime_updates(authuser_data)
+        await self._async_load_systems(authuser_data, announce=False)
+        self.realtime.async_start()
+        self.async_save_refresh_token()
+
+    async def _async_load_systems(
+        self, authuser_data: dict, announce: bool
+    ) -> frozenset[VivintDevice]:
+        """Load new systems and refresh known ones concurrently.
+
+        Systems that fail to load are retried in the background, while the other
+        systems are set up. With `announce`, the alarm panels and devices of newly
+        loaded systems are sent to the config entry and its platforms. Returns the
+        devices of known systems that changed.
+        """
+        systems = {system.id: system for system in self.account.systems}
+        tasks: list[Awaitable[set[VivintDevice]]] = []
+        for system_data in authuser_data[AuthUserAttribute.USERS][UserAttribute.SYSTEM]:
+            panel_id = int(system_data[SystemAttribute.PANEL_ID])
+            if system := systems.get(panel_id):
+                tasks.append(self.async_refresh_system(system))
+            elif panel_id not in self.pending_systems:
+                tasks.append(self._async_load_system(system_data, announce))
+        return frozenset().union(*await asyncio.gather(*tasks))
+
+    async def _async_load_system(
+        self, system_data: dict, announce: bool
+    ) -> set[VivintDevice]:
+        """Load a system, retrying in the background if it fails.
+
+        New devices are announced rather than reported as changed, so this always
+        returns an empty set.
+        """
+        panel_id = int(system_data[SystemAttribute.PANEL_ID])
+        try:
+            async with self._system_semaphore, asyncio.timeout(SYSTEM_TIMEOUT):
+                data = await self.account.api.get_system_data(panel_id)
+        except (
+            VivintSkyApiError,
+            ClientResponseError,
+            ClientConnectorError,
+            TimeoutError,
+        ) as ex:
+            if panel_id not in self.pending_systems:
+                _LOGGER.warning("Unable to load Vivint system %s: %s", panel_id, ex)
+            self.pending_systems[panel_id] = system_data
+            self._async_schedule_system_retry(panel_id)
+            return set()
+
+        system = System(
+            data=data,
+            api=self.account.api,
+            name=system_data.get(SystemAttribute.SYSTEM_NICKNAME),
+            is_admin=system_data.get(SystemAttribute.ADMIN, False),
+        )
+        self.account.systems.append(system)
+        self.pending_systems.pop(panel_id, None)
+        self._system_retries.pop(panel_id, None)
+        if announce:
+            for alarm_panel in system.alarm_panels:
+                async_dispatcher_send(self.hass, self.panel_signal, alarm_panel)
+                for device in (alarm_panel, *alarm_panel.devices):
+                    self.async_add_discovered_device(device)
+        return set()
+
+    async def async_refresh_system(self, system: System) -> set[VivintDevice]:
+        """Refresh a system and track whether its panels are available.
+
+        The refreshed data is compared with the current data in a worker thread, so
+        only the panels and devices that changed are updated on the event loop.
+        Returns the devices that changed.
+        """
+        try:
+            async with self._system_semaphore, asyncio.timeout(SYSTEM_TIMEOUT):
+                data = await self.account.api.get_system_data(system.id)
+        except (
+            VivintSkyApiError,
+            ClientResponseError,
+            ClientConnectorError,
+            TimeoutError,
+        ) as ex:
+            _LOGGER.debug("Unable to refresh Vivint system %s: %s", system.id, ex)
+            self.failed_systems.add(system.id)
+            return set()
+        self.failed_systems.discard(system.id)
+
+        start = perf_counter()
+        snapshot = snapshot_system(system)
+        loop_time = perf_counter() - start
+        diffs = await self.hass.async_add_executor_job(diff_system, data, snapshot)
+        start = perf_counter()
+        updated = apply_system_diff(system, diffs)
+        self.refresh_stats.record(loop_time + perf_counter() - start, len(updated))
+        return updated
+
+    @callback
+    def _async_schedule_system_retry(self, panel_id: int) -> None:
+        """Schedule loading a system again with exponential backoff."""
+        retries = self._system_retries[panel_id] = (
+            self._system_retries.get(panel_id, 0) + 1
+        )
+        delay = min(SYSTEM_RETRY_MAX_SECONDS, SYSTEM_RETRY_SECONDS * 2 ** (retries - 1))
+        self._unsub_system_retry[panel_id] = async_call_later(
+            self.hass, delay, partial(self._async_retry_system, panel_id)
+        )
+
+    async def _async_retry_system(self, panel_id: int, *_) -> None:
+        """Retry loading a system that failed to load."""
+        self._unsub_system_retry.pop(panel_id, None)
+        if (system_data := self.pending_systems.get(panel_id)) is not None:
+            await self._async_load_system(system_data, announce=True)
+
     async def disconnect(self) -> None:
         """Disconnect from Vivint, close the session and stop listener."""
         async with self._lock:
-            if self.account.connected:
+            self.realtime.async_stop()
+            self.motion_expiry.async_shutdown()
+            if self._unsub_token_refresh:
+                self._unsub_token_refresh()
+                self._unsub_token_refresh = None
+            for unsub in self._unsub_system_retry.values():
+                unsub()
+            self._unsub_system_retry.clear()
+            if self._unsub_discovered:
+                self._unsub_discovered()
+                self._unsub_discovered = None
+            await self.timeline.async_flush()
+            if self.account and self.account.connected:
                 await self.account.disconnect()
-            if not self.session.closed:
-                await self.session.close()
+            await self.manager.async_release_session(self.session)
             if self.__undo_listener:
                 self.__undo_listener()
                 self.__undo_listener = None
 
+    @callback
+    def async_subscribe(
+        self, emitter: VivintEmitter, event_name: str, target: Callable[[dict], None]
+    ) -> Callable[[], None]:
+        """Subscribe to an event of a Vivint device.
+
+        The hub registers a single listener with the device per event and dispatches to
+        all subscribers from there, so the device's listener list does not grow with
+        the number of entities.
+        """
+        key = (emitter, event_name)
+        if (targets := self._subscriptions.get(key)) is None:
+            targets = self._subscriptions[key] = []
+            self._emitter_unsubs[key] = emitter.on(
+                event_name, partial(self._async_dispatch, key)
+            )
+        targets.append(target)
+
+        @callback
+        def unsubscribe() -> None:
+            """Unsubscribe the target and release the device listener if unused."""
+            if target in targets:
+                targets.remove(target)
+            if not targets and self._subscriptions.get(key) is targets:
+                del self._subscriptions[key]
+                self._emitter_unsubs.pop(key)()
+
+        return unsubscribe
+
+    @callback
+    def _async_dispatch(self, key: tuple[VivintEmitter, str], data: dict) -> None:
+        """Dispatch a device event to its subscribers."""
+        for target in tuple(self._subscriptions.get(key, ())):
+            try:
+                target(data)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error handling %s event for %s", key[1], key[0])
+
+    @property
+    def listener_counts(self) -> dict[str, int | dict[str, int]]:
+        """Return the number of device listeners and subscribers per event."""
+        subscribers: dict[str, int] = {}
+        for (_, event_name), targets in self._subscriptions.items():
+            subscribers[event_name] = subscribers.get(event_name, 0) + len(targets)
+        return {
+            "device_listeners": len(self._emitter_unsubs),
+            "subscribers": subscribers,
+        }
+
     async def verify_mfa(self, code: str) -> bool:
         """Verify MFA."""
         try:
             await self.account.verify_mfa(code)
+            # vivintpy only marks accounts connected by `connect`, which reuses the
+            # verified session here, and only disconnects realtime updates of
+            # connected accounts
+            await self.account.connect()
             return self.save_session()
         except Exception as ex:
             raise ex
@@ -136,13 +635,138 @@ class VivintHub:
     def save_session(self) -> bool:
         """Save session for reuse."""
         self.logged_in = True
+        self.async_save_refresh_token()
+        # the short-lived hub of a config flow does not renew its session
+        if self.entry_id:
+            self._async_schedule_token_refresh()
         return self.logged_in
 
+    @callback
+    def async_save_refresh_token(self) -> None:
+        """Store a rotated refresh token in the config entry right away."""
+        if not self.entry_id or not (refresh_token := self.account.refresh_token):
+            return
+        entry = self.hass.config_entries.async_get_entry(self.entry_id)
+        if entry and entry.data.get(CONF_REFRESH_TOKEN) != refresh_token:
+            self.hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_REFRESH_TOKEN: refresh_token}
+            )
+            self._data = entry.data
+
+    @callback
+    def _async_schedule_token_refresh(self) -> None:
+        """Schedule renewing the session shortly before the id token expires."""
+        if self._unsub_token_refresh:
+            self._unsub_token_refresh()
+            self._unsub_token_refresh = None
+        try:
+            expires = jwt.decode(
+                self.account.api.tokens["id_token"],
+                options={"verify_signature": False},
+            )["exp"]
+        except (KeyError, jwt.PyJWTError):
+            return
+        self._unsub_token_refresh = async_call_later(
+            self.hass,
+            max(0, expires - time() - TOKEN_REFRESH_MARGIN),
+            self._async_refresh_token,
+        )
+
+    async def _async_refresh_token(self, *_) -> None:
+        """Renew the session in the background so requests never wait for it."""
+        self._unsub_token_refresh = None
+        refresh_token = self.account.refresh_token or self._data.get(CONF_REFRESH_TOKEN)
+        try:
+            await self.account.api.refresh_token(refresh_token)
+        except VivintSkyApiAuthenticationError as ex:
+            # leave it to the next request to login again
+            _LOGGER.warning("Unable to renew the Vivint session: %s", ex)
+            return
+        except (VivintSkyApiError, ClientResponseError, ClientConnectorError) as ex:
+            _LOGGER.debug("Unable to renew the Vivint session, retrying: %s", ex)
+            self._unsub_token_refresh = async_call_later(
+                self.hass, TOKEN_RETRY_SECONDS, self._async_refresh_token
+            )
+            return
+        self.async_save_refresh_token()
+        self._async_schedule_token_refresh()
 
-class VivintBaseEntity(CoordinatorEntity):
-    """Generic Vivint entity representing common data and methods."""
+
+class VivintDeviceEntity(CoordinatorEntity):
+    """Common state handling of entities backed by a Vivint device.
+
+    Entities can return a cheap fingerprint of their rendered state from
+    `_get_state_snapshot`. Device updates that change neither the fingerprint nor
+    the availability of the entity then skip the state write.
+    """
 
     device: VivintDevice
+    hub: VivintHub
+
+    _state_snapshot: Any = None
+    _state_available: bool | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Set up a listener for the entity."""
+        await super().async_added_to_hass()
+        # the state written when the entity is added
+        self._state_snapshot = self._get_state_snapshot()
+        self._state_available = self.available
+        self.async_on_remove(
+            self.hub.async_subscribe(self.device, UPDATE, self._async_device_updated)
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return if the entity and the system of its panel are available."""
+        return super().available and (
+            self.device.panel_id not in self.hub.failed_systems
+        )
+
+    def _get_state_snapshot(self) -> Any:
+        """Return a fingerprint of the device state the entity renders.
+
+        Entities that derive several properties from the same device data can read
+        them from the snapshot, so they are computed once per device update. `None`
+        writes the state on every device update.
+        """
+        return None
+
+    @callback
+    def _async_device_updated(self, _: dict) -> None:
+        """Handle an update of the device."""
+        self._async_write_state_if_changed()
+
+    @callback
+    def _async_write_state_if_changed(self, force: bool = False) -> None:
+        """Write the state, unless the update left the entity unchanged."""
+        snapshot = self._get_state_snapshot()
+        available = self.available
+        if (
+            not force
+            and snapshot is not None
+            and snapshot == self._state_snapshot
+            and available == self._state_available
+        ):
+            self.hub.suppressed_writes[self.platform.domain] += 1
+            return
+        self._state_snapshot = snapshot
+        self._state_available = available
+        self.hub.state_writes[self.platform.domain] += 1
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if a refresh changed the availability.
+
+        Devices changed by the refresh already wrote their state on their update.
+        """
+        if self.available != self._state_available:
+            self._async_write_state_if_changed(force=True)
+
+
+class VivintBaseEntity(VivintDeviceEntity):
+    """Generic Vivint entity representing common data and methods."""
 
     _attr_has_entity_name = True
 
@@ -160,6 +784,7 @@ class VivintBaseEntity(CoordinatorEntity):
 
         prefix = f"{device.alarm_panel.id}-" if device.alarm_panel else ""
         self._attr_unique_id = f"{prefix}{device.id}-{entity_description.key}"
+        self._state_snapshot = self._get_state_snapshot()
         device = self.device.parent if self.device.is_subdevice else self.device
         self._attr_device_info = DeviceInfo(
             identifiers={get_device_id(device)},
@@ -174,25 +799,22 @@ class VivintBaseEntity(CoordinatorEntity):
             ),
         )
 
-    async def async_added_to_hass(self) -> None:
-        """Set up a listener for the entity."""
-        await super().async_added_to_hass()
-        self.async_on_remove(
-            self.device.on(UPDATE, lambda _: self.async_write_ha_state())
-        )
-
 
-class VivintEntity(CoordinatorEntity):
+class VivintEntity(VivintDeviceEntity):
     """Generic Vivint entity representing common data and methods."""
 
-    device: VivintDevice
-
     def __init__(self, device: VivintDevice, hub: VivintHub) -> None:
         """Pass coordinator to CoordinatorEntity."""
         super().__init__(hub.coordinator)
         self.device = device
         self.hub = hub
 
+        prefix = f"{device.alarm_panel.id}-" if device.alarm_panel else ""
+        self._attr_unique_id = f"{prefix}{device.id}"
+        self._metadata = self._get_metadata()
+        self._update_metadata_attributes()
+        self._state_snapshot = self._get_state_snapshot()
+
         device = self.device.parent if self.device.is_subdevice else self.device
         self._attr_device_info = DeviceInfo(
             identifiers={get_device_id(device)},
@@ -207,14 +829,20 @@ class VivintEntity(CoordinatorEntity):
             ),
         )
 
-    async def async_added_to_hass(self) -> None:
-        """Set up a listener for the entity."""
-        await super().async_added_to_hass()
-        self.async_on_remove(
-            self.device.on(UPDATE, lambda _: self.async_write_ha_state())
-        )
-
-    @property
-    def name(self) -> str:
-        """Return the name of this entity."""
-        return self.device.name
+    def _get_metadata(self) -> tuple:
+        """Return the device metadata that the entity's static attributes use."""
+        return (self.device.name,)
+
+    def _update_metadata_attributes(self) -> None:
+        """Resolve the attributes that only change with the device metadata."""
+        self._attr_name = self.device.name
+
+    @callback
+    def _async_device_updated(self, _: dict) -> None:
+        """Handle an update of the device, rendering changed metadata as well."""
+        if (metadata := self._get_metadata()) != self._metadata:
+            self._metadata = metadata
+            self._update_metadata_attributes()
+            self._async_write_state_if_changed(force=True)
+            return
+        self._async_write_state_if_changed()
@@ -1,15 +1,17 @@
 """Support for Vivint lights."""
 
-from typing import Any
+from collections.abc import Iterable
+from typing import Any, NamedTuple
 
+from vivintpy.devices import VivintDevice
 from vivintpy.devices.switch import MultilevelSwitch
 
 from homeassistant.components.light import ATTR_BRIGHTNESS, ColorMode, LightEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import VivintConfigEntry
-from .hub import VivintEntity, VivintHub
+from .hub import VivintEntity, VivintHub, async_add_device_entities
 
 
 async def async_setup_entry(
@@ -18,19 +20,27 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Vivint lights using config entry."""
-    entities = []
     hub: VivintHub = entry.runtime_data
 
-    for system in hub.account.systems:
-        for alarm_panel in system.alarm_panels:
-            for device in alarm_panel.devices:
-                if isinstance(device, MultilevelSwitch):
-                    entities.append(VivintLightEntity(device=device, hub=hub))
+    @callback
+    def async_get_entities(devices: Iterable[VivintDevice]) -> list[VivintLightEntity]:
+        """Get light entities for the given devices."""
+        return [
+            VivintLightEntity(device=device, hub=hub)
+            for device in devices
+            if isinstance(device, MultilevelSwitch)
+        ]
 
-    if not entities:
-        return
+    entry.async_on_unload(
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
+    )
 
-    async_add_entities(entities)
+
+class LightState(NamedTuple):
+    """State of a Vivint light."""
+
+    is_on: bool
+    brightness: int
 
 
 class VivintLightEntity(VivintEntity, LightEntity):
@@ -40,26 +50,28 @@ class VivintLightEntity(VivintEntity, LightEntity):
 
     _attr_color_mode: ColorMode.BRIGHTNESS
     _attr_supported_color_modes = {ColorMode.BRIGHTNESS}
+    _state_snapshot: LightState
+
+    def _get_state_snapshot(self) -> LightState:
+        """Return the state of the light.
+
+        Vivint multilevel switches use a range of 0..100 to control brightness.
+        """
+        level = self.device.level
+        return LightState(
+            is_on=self.device.is_on,
+            brightness=round((level / 100) * 255) if level is not None else 0,
+        )
 
     @property
     def is_on(self) -> bool:
         """Return True if the light is on."""
-        return self.device.is_on
+        return self._state_snapshot.is_on
 
     @property
     def brightness(self) -> int:
-        """Return the brightness of the light between 0..255.
-
-        Vivint multilevel switches use a range of 0..100 to control brightness.
-        """
-        if self.device.level is not None:
-            return round((self.device.level / 100) * 255)
-        return 0
-
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
-        return f"{self.device.alarm_panel.id}-{self.device.id}"
+        """Return the brightness of the light between 0..255."""
+        return self._state_snapshot.brightness
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the light."""
@@ -1,15 +1,17 @@
 """Support for Vivint door locks."""
 
+from collections.abc import Iterable
 from typing import Any
 
+from vivintpy.devices import VivintDevice
 from vivintpy.devices.door_lock import DoorLock
 
 from homeassistant.components.lock import LockEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import VivintConfigEntry
-from .hub import VivintEntity, VivintHub
+from .hub import VivintEntity, VivintHub, async_add_device_entities
 
 
 async def async_setup_entry(
@@ -18,19 +20,20 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Vivint door locks using config entry."""
-    entities = []
     hub: VivintHub = entry.runtime_data
 
-    for system in hub.account.systems:
-        for alarm_panel in system.alarm_panels:
-            for device in alarm_panel.devices:
-                if isinstance(device, DoorLock):
-                    entities.append(VivintLockEntity(device=device, hub=hub))
+    @callback
+    def async_get_entities(devices: Iterable[VivintDevice]) -> list[VivintLockEntity]:
+        """Get door lock entities for the given devices."""
+        return [
+            VivintLockEntity(device=device, hub=hub)
+            for device in devices
+            if isinstance(device, DoorLock)
+        ]
 
-    if not entities:
-        return
-
-    async_add_entities(entities)
+    entry.async_on_unload(
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
+    )
 
 
 class VivintLockEntity(VivintEntity, LockEntity):
@@ -38,16 +41,15 @@ class VivintLockEntity(VivintEntity, LockEntity):
 
     device: DoorLock
 
+    def _get_state_snapshot(self) -> bool:
+        """Return whether the lock is locked."""
+        return self.device.is_locked
+
     @property
     def is_locked(self) -> bool:
         """Return true if the lock is locked."""
         return self.device.is_locked
 
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
-        return f"{self.device.alarm_panel.id}-{self.device.id}"
-
     async def async_lock(self, **kwargs: Any) -> None:
         """Lock the lock."""
         await self.device.lock()
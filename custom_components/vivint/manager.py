@@ -0,0 +1,216 @@
+"""Process-wide resources shared by all Vivint hubs."""
+
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+import random
+from time import monotonic
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+from aiohttp import ClientSession, TCPConnector, TraceConfig, TraceRequestStartParams
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util.ssl import client_context
+
+from .const import DOMAIN
+from .firmware import FirmwareUpdateScheduler
+from .response import VivintClientResponse
+
+if TYPE_CHECKING:
+    from .hub import VivintHub
+
+DATA_MANAGER = f"{DOMAIN}_manager"
+
+# How long a hub authenticated by the config flow waits to be adopted by its entry
+PENDING_HUB_SECONDS = 5 * 60
+POLL_INTERVAL = 300
+POLL_JITTER = 0.1
+REQUEST_BURST = 20
+REQUEST_RATE = 5
+
+
+class RequestBudget:
+    """A token bucket limiting the rate of requests to the Vivint cloud.
+
+    Tokens refill at `rate` per second up to `burst`. Requests wait in order for a
+    token once the bucket is empty.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize the request budget."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._lock = asyncio.Lock()
+        self.requests = 0
+        self.throttled = 0
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def async_acquire(self) -> None:
+        """Wait for and take a token from the budget."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                self.throttled += 1
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
+            self.requests += 1
+
+
+class VivintHubManager:
+    """Share connections, polls, firmware checks and a request budget between hubs.
+
+    Each hub keeps its own session, and with it its own cookies, but all sessions use
+    one connection pool. Polls of all registered coordinators are spread evenly over
+    the poll interval in round-robin order instead of each running on its own timer.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub manager."""
+        self._hass = hass
+        self._connector: TCPConnector | None = None
+        self._sessions: set[ClientSession] = set()
+        self.budget = RequestBudget(REQUEST_RATE, REQUEST_BURST)
+        self._trace_config = TraceConfig()
+        self._trace_config.on_request_start.append(self._async_on_request_start)
+        self._coordinators: list[DataUpdateCoordinator] = []
+        self._next_poll = 0
+        self._unsub_poll: CALLBACK_TYPE | None = None
+        self.firmware = FirmwareUpdateScheduler(hass)
+        self._pending_hubs: dict[str, tuple[VivintHub, CALLBACK_TYPE]] = {}
+
+    @callback
+    def async_create_session(self) -> ClientSession:
+        """Create a session that uses the shared connection pool."""
+        if self._connector is None or self._connector.closed:
+            self._connector = TCPConnector(ssl=client_context())
+        session = ClientSession(
+            connector=self._connector,
+            connector_owner=False,
+            trace_configs=[self._trace_config],
+            response_class=VivintClientResponse,
+        )
+        self._sessions.add(session)
+        return session
+
+    async def async_release_session(self, session: ClientSession) -> None:
+        """Close a session and the shared connection pool once it is unused."""
+        self._sessions.discard(session)
+        if not session.closed:
+            await session.close()
+        if not self._sessions and self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+    async def _async_on_request_start(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestStartParams,
+    ) -> None:
+        """Hold a request back until the budget allows it."""
+        await self.budget.async_acquire()
+
+    @callback
+    def async_register_poll(self, coordinator: DataUpdateCoordinator) -> CALLBACK_TYPE:
+        """Add a coordinator to the shared poll rotation."""
+        self._coordinators.append(coordinator)
+        if not self._unsub_poll:
+            self._async_schedule_poll()
+
+        @callback
+        def unregister() -> None:
+            """Remove the coordinator from the poll rotation."""
+            if coordinator in self._coordinators:
+                self._coordinators.remove(coordinator)
+            if not self._coordinators and self._unsub_poll:
+                self._unsub_poll()
+                self._unsub_poll = None
+
+        return unregister
+
+    @callback
+    def _async_schedule_poll(self) -> None:
+        """Schedule the next poll so each coordinator is polled once per interval."""
+        delay = POLL_INTERVAL / len(self._coordinators)
+        delay *= 1 + random.uniform(-POLL_JITTER, POLL_JITTER)
+        self._unsub_poll = async_call_later(self._hass, delay, self._async_poll_next)
+
+    @callback
+    def _async_poll_next(self, *_) -> None:
+        """Refresh the next coordinator in the rotation."""
+        self._unsub_poll = None
+        if not self._coordinators:
+            return
+        self._next_poll %= len(self._coordinators)
+        coordinator = self._coordinators[self._next_poll]
+        self._next_poll += 1
+        self._hass.async_create_background_task(
+            coordinator.async_refresh(), f"{DOMAIN}_poll"
+        )
+        self._async_schedule_poll()
+
+    @callback
+    def async_hand_off_hub(self, username: str, hub: VivintHub) -> None:
+        """Keep an authenticated hub for the config entry of `username` to adopt.
+
+        Hubs that are not adopted in time are disconnected.
+        """
+        self._async_discard_pending_hub(username)
+        unsub = async_call_later(
+            self._hass,
+            PENDING_HUB_SECONDS,
+            partial(self._async_discard_pending_hub, username),
+        )
+        self._pending_hubs[username] = (hub, unsub)
+
+    @callback
+    def async_take_hub(self, username: str) -> VivintHub | None:
+        """Take the hub handed off for `username`, if it is still fresh."""
+        if (pending := self._pending_hubs.pop(username, None)) is None:
+            return None
+        hub, unsub = pending
+        unsub()
+        return hub
+
+    @callback
+    def _async_discard_pending_hub(self, username: str, *_) -> None:
+        """Disconnect a hub that was handed off but not adopted."""
+        if (pending := self._pending_hubs.pop(username, None)) is None:
+            return
+        hub, unsub = pending
+        unsub()
+        self._hass.async_create_background_task(
+            hub.disconnect(), f"{DOMAIN}_discard_pending_hub"
+        )
+
+    @property
+    def diagnostics(self) -> dict[str, int]:
+        """Return statistics of the shared resources."""
+        return {
+            "sessions": len(self._sessions),
+            "polled_coordinators": len(self._coordinators),
+            "requests": self.budget.requests,
+            "throttled_requests": self.budget.throttled,
+        }
+
+
+@callback
+def async_get_manager(hass: HomeAssistant) -> VivintHubManager:
+    """Get the hub manager shared by all config entries."""
+    if (manager := hass.data.get(DATA_MANAGER)) is None:
+        manager = hass.data[DATA_MANAGER] = VivintHubManager(hass)
+    return manager
@@ -0,0 +1,305 @@
+"""A rolling buffer of recent camera video for clips that start before an event."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+import logging
+import os
+from time import monotonic
+from typing import BinaryIO
+
+from aiohttp import ClientResponseError
+from aiohttp.client_exceptions import ClientConnectorError
+from vivintpy.exceptions import VivintSkyApiError
+
+from homeassistant.components.ffmpeg import get_ffmpeg_manager
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# Hard limit of buffered video per camera, regardless of the configured duration
+PREROLL_MAX_BYTES = 16 * 1024 * 1024
+TS_PACKET_BYTES = 188
+TS_SYNC_BYTE = 0x47
+PAT_PID = 0
+# A whole number of MPEG-TS packets
+READ_CHUNK_BYTES = TS_PACKET_BYTES * 256
+RESTART_SECONDS = 30
+STOP_TIMEOUT = 5
+
+
+class PrerollBuffer:
+    """Keep the last seconds of a camera's stream in memory.
+
+    ffmpeg copies the stream, without re-encoding it, into MPEG-TS chunks that are
+    dropped once they are older than the buffer duration or the buffer exceeds its
+    memory limit. Chunks are split at keyframes and the buffer always starts at
+    one, so a clip starts with a decodable frame. Saving a clip writes the latest
+    PAT and PMT followed by the buffered chunks to disk right away and then keeps
+    appending the live stream until the clip is complete.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        get_source: Callable[[], Awaitable[str | None]],
+        seconds: float,
+        max_bytes: int = PREROLL_MAX_BYTES,
+    ) -> None:
+        """Initialize the pre-roll buffer."""
+        self._hass = hass
+        self._name = name
+        self._get_source = get_source
+        self.seconds = seconds
+        self._max_bytes = max_bytes
+        # (time, packets, starts with a keyframe)
+        self._chunks: deque[tuple[float, bytes, bool]] = deque()
+        self._size = 0
+        self._pmt_pid: int | None = None
+        self._pat = b""
+        self._pmt = b""
+        self._clips: set[asyncio.Queue[tuple[bytes, bool]]] = set()
+        self._task: asyncio.Task | None = None
+        self._process: asyncio.subprocess.Process | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return `True` if the buffer is being filled."""
+        return self._task is not None
+
+    @property
+    def size(self) -> int:
+        """Return the number of buffered bytes."""
+        return self._size
+
+    @callback
+    def async_start(self) -> None:
+        """Start filling the buffer."""
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), f"vivint_preroll_{self._name}"
+            )
+
+    async def async_stop(self) -> None:
+        """Stop filling the buffer and drop its contents."""
+        if (task := self._task) is None:
+            return
+        self._task = None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self._chunks.clear()
+        self._size = 0
+        self._pmt_pid = None
+        self._pat = self._pmt = b""
+
+    async def async_restart(self) -> None:
+        """Restart the buffer, for instance after its source changed."""
+        if self.running:
+            await self.async_stop()
+            self.async_start()
+
+    async def _async_run(self) -> None:
+        """Run ffmpeg and buffer its output, restarting it when it exits."""
+        while True:
+            try:
+                if source := await self._get_source():
+                    await self._async_buffer(source)
+            except (
+                OSError,
+                VivintSkyApiError,
+                ClientResponseError,
+                ClientConnectorError,
+            ) as ex:
+                _LOGGER.debug("Pre-roll buffer of %s failed: %s", self._name, ex)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Unexpected error in pre-roll buffer of %s", self._name
+                )
+            await asyncio.sleep(RESTART_SECONDS)
+
+    async def _async_buffer(self, source: str) -> None:
+        """Buffer the stream of a source until ffmpeg exits."""
+        self._process = await asyncio.create_subprocess_exec(
+            get_ffmpeg_manager(self._hass).binary,
+            *("-hide_banner", "-loglevel", "error", "-rtsp_transport", "tcp"),
+            *("-i", source, "-map", "0:v", "-map", "0:a?", "-c", "copy"),
+            *("-f", "mpegts", "pipe:1"),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout = self._process.stdout
+        try:
+            while True:
+                try:
+                    chunk = await stdout.readexactly(READ_CHUNK_BYTES)
+                    if chunk[0] != TS_SYNC_BYTE:
+                        chunk = await self._async_resync(stdout, chunk)
+                except asyncio.IncompleteReadError as ex:
+                    # keep the whole packets of the last read
+                    whole = len(ex.partial) // TS_PACKET_BYTES * TS_PACKET_BYTES
+                    if whole:
+                        self._append(ex.partial[:whole])
+                    break
+                if chunk:
+                    self._append(chunk)
+        finally:
+            await self._async_terminate()
+        _LOGGER.debug("Pre-roll stream of %s ended", self._name)
+
+    async def _async_resync(self, stdout: asyncio.StreamReader, chunk: bytes) -> bytes:
+        """Return the packets of a chunk that lost packet alignment.
+
+        The rest of the packet the chunk ends in is read, so the following reads
+        are aligned again. A chunk without packets is dropped.
+        """
+        _LOGGER.debug("Pre-roll stream of %s lost sync", self._name)
+        if (offset := find_sync(chunk)) is None:
+            return b""
+        return chunk[offset:] + await stdout.readexactly(offset)
+
+    async def _async_terminate(self) -> None:
+        """Stop the ffmpeg process."""
+        if (process := self._process) is None:
+            return
+        self._process = None
+        if process.returncode is None:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), STOP_TIMEOUT)
+            except TimeoutError:
+                process.kill()
+                await process.wait()
+
+    def _append(self, chunk: bytes) -> None:
+        """Add whole packets and drop the chunks that no longer fit in the buffer.
+
+        The buffer is trimmed to start at a keyframe, so it may briefly hold less
+        than its duration.
+        """
+        now = monotonic()
+        for part, keyframe in self._split_keyframes(chunk):
+            self._chunks.append((now, part, keyframe))
+            self._size += len(part)
+            for clip in self._clips:
+                clip.put_nowait((part, keyframe))
+        while self._chunks and (
+            self._size > self._max_bytes
+            or now - self._chunks[0][0] > self.seconds
+            or not self._chunks[0][2]
+        ):
+            self._size -= len(self._chunks.popleft()[1])
+
+    def _split_keyframes(self, chunk: bytes) -> list[tuple[bytes, bool]]:
+        """Split packets before each keyframe and remember the latest PAT and PMT."""
+        parts: list[tuple[bytes, bool]] = []
+        start = 0
+        keyframe = False
+        for offset in range(0, len(chunk), TS_PACKET_BYTES):
+            packet = chunk[offset : offset + TS_PACKET_BYTES]
+            pid = get_pid(packet)
+            if pid == PAT_PID:
+                self._pat = packet
+                self._pmt_pid = get_pmt_pid(packet) or self._pmt_pid
+            elif pid == self._pmt_pid:
+                self._pmt = packet
+            elif is_keyframe(packet):
+                if offset > start:
+                    parts.append((chunk[start:offset], keyframe))
+                    start = offset
+                keyframe = True
+                continue
+            if offset == start:
+                keyframe = False
+        parts.append((chunk[start:], keyframe))
+        return parts
+
+    async def async_save_clip(self, path: str, duration: float) -> None:
+        """Write the buffered video followed by `duration` seconds of live video."""
+        # live chunks are queued from the moment the buffered ones are taken
+        chunks = [self._pat + self._pmt]
+        chunks.extend(chunk for _, chunk, _ in self._chunks)
+        # without buffered video the clip starts at the next live keyframe
+        started = len(chunks) > 1
+        clip: asyncio.Queue[tuple[bytes, bool]] = asyncio.Queue()
+        self._clips.add(clip)
+        try:
+            file = await self._hass.async_add_executor_job(_open_clip, path)
+            try:
+                await self._hass.async_add_executor_job(file.writelines, chunks)
+                end = monotonic() + duration
+                while (remaining := end - monotonic()) > 0 and self.running:
+                    try:
+                        live = [await asyncio.wait_for(clip.get(), remaining)]
+                    except TimeoutError:
+                        break
+                    while not clip.empty():
+                        live.append(clip.get_nowait())
+                    chunks = []
+                    for chunk, keyframe in live:
+                        started = started or keyframe
+                        if started:
+                            chunks.append(chunk)
+                    await self._hass.async_add_executor_job(file.writelines, chunks)
+            finally:
+                await self._hass.async_add_executor_job(file.close)
+        finally:
+            self._clips.discard(clip)
+
+
+def get_pid(packet: bytes) -> int:
+    """Return the PID of an MPEG-TS packet."""
+    return (packet[1] & 0x1F) << 8 | packet[2]
+
+
+def is_keyframe(packet: bytes) -> bool:
+    """Return `True` if an MPEG-TS packet starts a random access point.
+
+    ffmpeg sets the random access indicator of the adaptation field on the first
+    packet of each keyframe.
+    """
+    return (
+        len(packet) >= 6
+        and packet[3] & 0x20 != 0
+        and packet[4] > 0
+        and packet[5] & 0x40 != 0
+    )
+
+
+def get_pmt_pid(packet: bytes) -> int | None:
+    """Return the PID of the first program's PMT listed in a PAT packet."""
+    if not packet[1] & 0x40:
+        return None
+    payload = 4 + (1 + packet[4] if packet[3] & 0x20 else 0)
+    section = payload + 1 + packet[payload]
+    end = (
+        min(
+            section + 3 + ((packet[section + 1] & 0x0F) << 8 | packet[section + 2]),
+            len(packet),
+        )
+        - 4
+    )
+    for offset in range(section + 8, end - 3, 4):
+        if packet[offset] << 8 | packet[offset + 1]:
+            return (packet[offset + 2] & 0x1F) << 8 | packet[offset + 3]
+    return None
+
+
+def find_sync(data: bytes) -> int | None:
+    """Return the offset of the first packet that is followed by another one."""
+    for offset in range(min(TS_PACKET_BYTES, len(data) - TS_PACKET_BYTES)):
+        if data[offset] == data[offset + TS_PACKET_BYTES] == TS_SYNC_BYTE:
+            return offset
+    return None
+
+
+def _open_clip(path: str) -> BinaryIO:
+    """Open a clip file for writing, creating its directory if needed."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return open(path, "wb")
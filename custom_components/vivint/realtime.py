@@ -0,0 +1,209 @@
+"""Monitor and recover the realtime connection of a Vivint account."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+import random
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientResponseError
+from aiohttp.client_exceptions import ClientConnectorError
+from pubnub.callbacks import SubscribeCallback
+from pubnub.enums import PNOperationType, PNStatusCategory
+from pubnub.models.consumer.common import PNStatus
+from pubnub.pubnub_asyncio import PubNubAsyncio
+from vivintpy.account import Account
+from vivintpy.exceptions import VivintSkyApiError
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .hub import VivintHub
+
+_LOGGER = logging.getLogger(__name__)
+
+OUTAGE_HISTORY = 20
+RECONNECT_MIN_SECONDS = 2
+RECONNECT_MAX_SECONDS = 300
+
+CONNECTED_CATEGORIES = {
+    PNStatusCategory.PNConnectedCategory,
+    PNStatusCategory.PNReconnectedCategory,
+}
+DISCONNECTED_CATEGORIES = {
+    PNStatusCategory.PNDisconnectedCategory,
+    PNStatusCategory.PNUnexpectedDisconnectCategory,
+}
+
+
+def get_pubnub(account: Account) -> PubNubAsyncio | None:
+    """Return the PubNub instance of an account's realtime subscription.
+
+    vivintpy does not expose it, so it is found by type rather than by the name of
+    a private attribute.
+    """
+    return next(
+        (value for value in vars(account).values() if isinstance(value, PubNubAsyncio)),
+        None,
+    )
+
+
+class RealtimeMonitor(SubscribeCallback):
+    """Reconnect the realtime subscription of a hub after it drops.
+
+    PubNub gives up after a few reconnect attempts, after which updates are only
+    picked up by the next poll. The monitor takes over as soon as the subscription
+    reports an error, subscribes again with jittered exponential backoff and, once
+    connected, refreshes the account's systems to pick up what was missed.
+    """
+
+    def __init__(self, hass: HomeAssistant, hub: VivintHub) -> None:
+        """Initialize the realtime monitor."""
+        super().__init__()
+        self._hass = hass
+        self._hub = hub
+        self._pubnub: PubNubAsyncio | None = None
+        self._outage_start: float | None = None
+        self._outage_started_at: float | None = None
+        self._attempt = 0
+        self._unsub_reconnect: CALLBACK_TYPE | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self.reconnects = 0
+        self.outages: deque[dict[str, Any]] = deque(maxlen=OUTAGE_HISTORY)
+
+    @property
+    def connected(self) -> bool:
+        """Return `True` if the realtime subscription is not in an outage."""
+        return self._outage_start is None
+
+    @callback
+    def async_start(self) -> None:
+        """Start monitoring the account's current subscription."""
+        self._pubnub = get_pubnub(self._hub.account)
+        if self._pubnub:
+            self._pubnub.add_listener(self)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop monitoring and cancel any pending reconnect."""
+        self._async_detach()
+        if self._unsub_reconnect:
+            self._unsub_reconnect()
+            self._unsub_reconnect = None
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+
+    @callback
+    def _async_detach(self) -> None:
+        """Stop listening to the current subscription."""
+        if self._pubnub:
+            self._pubnub.remove_listener(self)
+            self._pubnub = None
+
+    def status(self, pubnub: PubNubAsyncio, status: PNStatus) -> None:
+        """Handle a status update of the subscription."""
+        if pubnub is not self._pubnub:
+            return
+        if status.category in CONNECTED_CATEGORIES:
+            self._async_connected()
+        elif status.category in DISCONNECTED_CATEGORIES or (
+            status.is_error()
+            and status.operation == PNOperationType.PNSubscribeOperation
+        ):
+            self._async_disconnected()
+
+    def presence(self, pubnub: PubNubAsyncio, presence: Any) -> None:
+        """Ignore presence updates."""
+
+    def message(self, pubnub: PubNubAsyncio, message: Any) -> None:
+        """Ignore messages, they are handled by vivintpy."""
+
+    @callback
+    def _async_disconnected(self) -> None:
+        """Start an outage and schedule a reconnect."""
+        if self._outage_start is None:
+            self._outage_start = monotonic()
+            self._outage_started_at = time()
+            _LOGGER.warning("Lost realtime connection to Vivint, reconnecting")
+        if self._unsub_reconnect or self._reconnect_task:
+            return
+        delay = min(RECONNECT_MAX_SECONDS, RECONNECT_MIN_SECONDS * 2**self._attempt)
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        self._attempt += 1
+        self._unsub_reconnect = async_call_later(
+            self._hass, delay, self._async_start_reconnect
+        )
+
+    @callback
+    def _async_start_reconnect(self, *_) -> None:
+        """Start a reconnect attempt."""
+        self._unsub_reconnect = None
+        self._reconnect_task = self._hass.async_create_background_task(
+            self._async_reconnect(), f"{DOMAIN}_realtime_reconnect"
+        )
+
+    async def _async_reconnect(self) -> None:
+        """Replace the dropped subscription with a new one."""
+        self.reconnects += 1
+        self._async_detach()
+        account = self._hub.account
+        try:
+            # disconnecting removes vivintpy's listener and unsubscribes its channels
+            # before the PubNub instance is stopped, so listeners do not stack up
+            await account.disconnect()
+            await account.connect(subscribe_for_realtime_updates=True)
+        except (VivintSkyApiError, ClientResponseError, ClientConnectorError) as ex:
+            _LOGGER.debug("Unable to resubscribe for realtime updates: %s", ex)
+            self._reconnect_task = None
+            self._async_disconnected()
+            return
+        self._reconnect_task = None
+        self.async_start()
+
+    @callback
+    def _async_connected(self) -> None:
+        """End an outage and resync the systems that missed updates."""
+        self._attempt = 0
+        if self._outage_start is None:
+            return
+        duration = monotonic() - self._outage_start
+        self.outages.append(
+            {
+                "start": dt_util.utc_from_timestamp(
+                    self._outage_started_at
+                ).isoformat(),
+                "duration": round(duration, 1),
+            }
+        )
+        self._outage_start = self._outage_started_at = None
+        _LOGGER.info("Realtime connection to Vivint restored after %.0fs", duration)
+        self._hass.async_create_background_task(
+            self._async_resync(), f"{DOMAIN}_realtime_resync"
+        )
+
+    async def _async_resync(self) -> None:
+        """Refresh the account's systems once after an outage."""
+        changed = await asyncio.gather(
+            *(
+                self._hub.async_refresh_system(system)
+                for system in self._hub.account.systems
+            )
+        )
+        self._hub.coordinator.async_set_updated_data(frozenset().union(*changed))
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the state and outage history of the realtime connection."""
+        return {
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            "outages": list(self.outages),
+        }
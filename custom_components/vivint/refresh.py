@@ -0,0 +1,170 @@
+"""Diff system refreshes off the event loop."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from vivintpy.const import AlarmPanelAttribute, SystemAttribute
+from vivintpy.devices import VivintDevice
+from vivintpy.devices.alarm_panel import AlarmPanel
+from vivintpy.system import System
+
+PANEL_KEY_EXCLUDES = (AlarmPanelAttribute.DEVICES, AlarmPanelAttribute.UNREGISTERED)
+
+
+@dataclass
+class PanelDiff:
+    """Changes of an alarm panel between its current data and a refresh."""
+
+    data: dict
+    # the panel is new or has new or unregistered devices, so vivintpy parses it
+    needs_refresh: bool = False
+    panel_changed: bool = False
+    changed_devices: list[dict] = field(default_factory=list)
+
+
+type SystemSnapshot = dict[tuple[int, int], tuple[dict, dict[Any, dict]]]
+
+
+def snapshot_system(system: System) -> SystemSnapshot:
+    """Return a copy of the current raw data of a system's panels and devices.
+
+    Realtime updates replace top-level values of the raw data while a refresh is
+    diffed in a worker thread, so shallow copies are enough to read it safely.
+    """
+    return {
+        (alarm_panel.id, alarm_panel.partition_id): (
+            dict(alarm_panel.data),
+            {
+                device.data.get(AlarmPanelAttribute.ID): dict(device.data)
+                for device in alarm_panel.devices
+            },
+        )
+        for alarm_panel in system.alarm_panels
+    }
+
+
+def diff_system(data: dict, snapshot: SystemSnapshot) -> list[PanelDiff]:
+    """Compare refreshed system data with a snapshot of the current data.
+
+    This runs in a worker thread and only reads the snapshot.
+    """
+    diffs: list[PanelDiff] = []
+    for panel_data in data[SystemAttribute.SYSTEM][SystemAttribute.PARTITION]:
+        key = (
+            int(panel_data[AlarmPanelAttribute.PANEL_ID]),
+            int(panel_data[AlarmPanelAttribute.PARTITION_ID]),
+        )
+        if (current := snapshot.get(key)) is None:
+            diffs.append(PanelDiff(panel_data, needs_refresh=True))
+            continue
+
+        panel, devices = current
+        diff = PanelDiff(panel_data)
+        diff.panel_changed = any(
+            panel_data.get(attr) != panel.get(attr)
+            for attr in panel_data.keys() | panel.keys()
+            if attr not in PANEL_KEY_EXCLUDES
+        )
+        diff.needs_refresh = panel_data.get(
+            AlarmPanelAttribute.UNREGISTERED
+        ) != panel.get(AlarmPanelAttribute.UNREGISTERED)
+        for device_data in panel_data[AlarmPanelAttribute.DEVICES]:
+            device = devices.get(device_data.get(AlarmPanelAttribute.ID))
+            if device is None:
+                diff.needs_refresh = True
+            elif device_data != device:
+                diff.changed_devices.append(device_data)
+        if diff.needs_refresh or diff.panel_changed or diff.changed_devices:
+            diffs.append(diff)
+    return diffs
+
+
+def apply_system_diff(system: System, diffs: list[PanelDiff]) -> set[VivintDevice]:
+    """Apply the changes of a refresh to a system and return the updated devices."""
+    updated: set[VivintDevice] = set()
+    for diff in diffs:
+        alarm_panel = next(
+            (
+                alarm_panel
+                for alarm_panel in system.alarm_panels
+                if alarm_panel.id == int(diff.data[AlarmPanelAttribute.PANEL_ID])
+                and alarm_panel.partition_id
+                == int(diff.data[AlarmPanelAttribute.PARTITION_ID])
+            ),
+            None,
+        )
+        if alarm_panel is None:
+            alarm_panel = AlarmPanel(diff.data, system)
+            system.alarm_panels.append(alarm_panel)
+            updated.update((alarm_panel, *alarm_panel.devices))
+            continue
+        if diff.needs_refresh:
+            alarm_panel.refresh(diff.data)
+            updated.update((alarm_panel, *alarm_panel.devices))
+            continue
+        if diff.panel_changed:
+            alarm_panel.update_data(diff.data, override=True)
+            updated.add(alarm_panel)
+        devices = {
+            device.data.get(AlarmPanelAttribute.ID): device
+            for device in alarm_panel.devices
+        }
+        for device_data in diff.changed_devices:
+            device = devices[device_data[AlarmPanelAttribute.ID]]
+            device.update_data(device_data, override=True)
+            updated.add(device)
+        if diff.changed_devices and not diff.panel_changed:
+            # the panel's raw data still holds the previous device data
+            _replace_device_data(alarm_panel, diff.changed_devices)
+    return updated
+
+
+def _replace_device_data(alarm_panel: AlarmPanel, devices: list[dict]) -> None:
+    """Replace the raw data of devices in the raw data of their panel."""
+    changed = {
+        device_data[AlarmPanelAttribute.ID]: device_data for device_data in devices
+    }
+    panel_devices: list[dict] = alarm_panel.data.setdefault(
+        AlarmPanelAttribute.DEVICES, []
+    )
+    for index, device_data in enumerate(panel_devices):
+        if (
+            new_data := changed.pop(device_data.get(AlarmPanelAttribute.ID), None)
+        ) is not None:
+            panel_devices[index] = new_data
+    panel_devices.extend(changed.values())
+
+
+class RefreshStats:
+    """Track how long applying refreshes blocks the event loop."""
+
+    def __init__(self) -> None:
+        """Initialize the refresh statistics."""
+        self.refreshes = 0
+        self.updated_devices = 0
+        self.last_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_seconds = 0.0
+
+    def record(self, seconds: float, updated_devices: int) -> None:
+        """Record the loop time of a refresh."""
+        self.refreshes += 1
+        self.updated_devices = updated_devices
+        self.last_seconds = seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.total_seconds += seconds
+
+    @property
+    def diagnostics(self) -> dict[str, float | int]:
+        """Return the loop time statistics in milliseconds."""
+        return {
+            "refreshes": self.refreshes,
+            "last_updated_devices": self.updated_devices,
+            "last_loop_ms": round(self.last_seconds * 1000, 2),
+            "max_loop_ms": round(self.max_seconds * 1000, 2),
+            "average_loop_ms": round(
+                self.total_seconds * 1000 / (self.refreshes or 1), 2
+            ),
+        }
@@ -0,0 +1,60 @@
+"""Decode Vivint API responses with orjson."""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+from collections.abc import Callable
+import json
+from typing import Any
+
+from aiohttp import ClientResponse
+
+from homeassistant.util.json import json_loads
+
+# JSON bodies of at least this size are decoded in a worker thread
+OFFLOAD_JSON_BYTES = 64 * 1024
+
+
+def decode_json(body: bytes, encoding: str = "utf-8") -> Any:
+    """Decode a JSON body, with the standard library if orjson cannot decode it.
+
+    orjson is faster but rejects some documents the standard library accepts, such
+    as `NaN` or integers beyond 64 bits.
+    """
+    if codecs.lookup(encoding).name == "utf-8":
+        try:
+            return json_loads(body)
+        except ValueError:
+            pass
+    return json.loads(body.decode(encoding))
+
+
+class VivintClientResponse(ClientResponse):
+    """A client response that decodes JSON bodies with orjson.
+
+    Large bodies are decoded in a worker thread.
+    """
+
+    async def json(
+        self,
+        *,
+        encoding: str | None = None,
+        loads: Callable[[str], Any] | None = None,
+        content_type: str | None = "application/json",
+    ) -> Any:
+        """Read and decode a JSON body."""
+        if loads is not None or (content_type and self.content_type != content_type):
+            # aiohttp checks other content types and decodes with custom loads
+            return await super().json(
+                encoding=encoding, loads=loads or json.loads, content_type=content_type
+            )
+        body = await self.read()
+        if not body.strip():
+            return None
+        encoding = encoding or self.get_encoding()
+        if len(body) < OFFLOAD_JSON_BYTES:
+            return decode_json(body, encoding)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, decode_json, body, encoding
+        )
@@ -0,0 +1,88 @@
+"""Support for Vivint selects."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from vivintpy.devices import VivintDevice
+from vivintpy.devices.camera import Camera as VivintCamera
+
+from homeassistant.components.select import SelectEntity, SelectEntityDescription
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
+
+from . import VivintConfigEntry
+from .const import STREAM_QUALITIES, STREAM_QUALITY_AUTO
+from .hub import VivintBaseEntity, VivintHub, async_add_device_entities
+
+STREAM_QUALITY = SelectEntityDescription(
+    key="stream_quality",
+    entity_category=EntityCategory.CONFIG,
+    translation_key="stream_quality",
+    options=STREAM_QUALITIES,
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: VivintConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Vivint selects using config entry."""
+    hub: VivintHub = entry.runtime_data
+
+    @callback
+    def async_get_entities(
+        devices: Iterable[VivintDevice],
+    ) -> list[VivintStreamQualitySelectEntity]:
+        """Get stream quality select entities for the given devices."""
+        return [
+            VivintStreamQualitySelectEntity(
+                device=device, hub=hub, entity_description=STREAM_QUALITY
+            )
+            for device in devices
+            if isinstance(device, VivintCamera)
+        ]
+
+    entry.async_on_unload(
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
+    )
+
+
+class VivintStreamQualitySelectEntity(VivintBaseEntity, SelectEntity, RestoreEntity):
+    """Vivint camera stream quality select.
+
+    Automatic uses the SD stream for snapshots and the configured stream for live
+    viewing, while HD and SD pin the camera to a single stream.
+    """
+
+    device: VivintCamera
+
+    def _get_state_snapshot(self) -> str:
+        """Return the selected stream quality."""
+        return self.current_option
+
+    @property
+    def current_option(self) -> str:
+        """Return the selected stream quality."""
+        return self.hub.camera_stream_quality.get(self.device, STREAM_QUALITY_AUTO)
+
+    async def async_select_option(self, option: str) -> None:
+        """Change the selected stream quality."""
+        self.hub.camera_stream_quality[self.device] = option
+        self.async_write_ha_state()
+        async_dispatcher_send(self.hass, self.hub.stream_quality_signal, self.device)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last selected stream quality."""
+        await super().async_added_to_hass()
+        if (last_state := await self.async_get_last_state()) and (
+            last_state.state in self.options
+        ):
+            self.hub.camera_stream_quality[self.device] = last_state.state
+            async_dispatcher_send(
+                self.hass, self.hub.stream_quality_signal, self.device
+            )
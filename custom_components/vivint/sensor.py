@@ -1,23 +1,23 @@
 """Support for Vivint sensors."""
 
+from collections.abc import Iterable
+
 from vivintpy.devices import VivintDevice
+from vivintpy.devices.alarm_panel import AlarmPanel
 
 from homeassistant.components.sensor import (
-    DOMAIN as SENSOR_DOMAIN,
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.const import PERCENTAGE
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
 from . import VivintConfigEntry
-from .const import DOMAIN
-from .hub import VivintEntity, VivintHub
+from .hub import VivintEntity, VivintHub, async_add_device_entities
 
 
 async def async_setup_entry(
@@ -26,41 +26,23 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Vivint sensors using config entry."""
-    entities = []
     hub: VivintHub = entry.runtime_data
 
-    for system in hub.account.systems:
-        for alarm_panel in system.alarm_panels:
-            for device in alarm_panel.devices:
-                if (
-                    not device.is_subdevice
-                    and getattr(device, "battery_level", None) is not None
-                ):
-                    entities.append(VivintBatterySensorEntity(device=device, hub=hub))
-
-    if not entities:
-        return
-
-    async_add_entities(entities)
-
     @callback
-    def async_add_sensor(device: VivintDevice) -> None:
-        """Add Vivint sensor."""
-        entities: list[VivintBatterySensorEntity] = []
-        if (
-            not device.is_subdevice
+    def async_get_entities(
+        devices: Iterable[VivintDevice],
+    ) -> list[VivintBatterySensorEntity]:
+        """Get battery sensor entities for the given devices."""
+        return [
+            VivintBatterySensorEntity(device=device, hub=hub)
+            for device in devices
+            if not isinstance(device, AlarmPanel)
+            and not device.is_subdevice
             and getattr(device, "battery_level", None) is not None
-        ):
-            entities.append(VivintBatterySensorEntity(device=device, hub=hub))
-
-        async_add_entities(entities)
+        ]
 
     entry.async_on_unload(
-        async_dispatcher_connect(
-            hass,
-            f"{DOMAIN}_{entry.entry_id}_add_{SENSOR_DOMAIN}",
-            async_add_sensor,
-        )
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
     )
 
 
@@ -72,15 +54,13 @@ class VivintBatterySensorEntity(VivintEntity, SensorEntity):
     _attr_native_unit_of_measurement = PERCENTAGE
     _attr_state_class = SensorStateClass.MEASUREMENT
 
-    @property
-    def name(self) -> str:
-        """Return the name of this entity."""
-        return f"{self.device.name} Battery Level"
+    def _get_state_snapshot(self) -> int | None:
+        """Return the battery level."""
+        return self.device.battery_level
 
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
-        return f"{self.device.alarm_panel.id}-{self.device.id}"
+    def _update_metadata_attributes(self) -> None:
+        """Resolve the attributes that only change with the device metadata."""
+        self._attr_name = f"{self.device.name} Battery Level"
 
     @property
     def native_value(self) -> StateType:
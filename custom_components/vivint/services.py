@@ -0,0 +1,94 @@
+"""Services and websocket commands for the Vivint integration."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from vivintpy.devices.camera import DOORBELL_DING, MOTION_DETECTED
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .hub import VivintHub
+
+ATTR_END_TIME = "end_time"
+ATTR_EVENT_TYPE = "event_type"
+ATTR_START_TIME = "start_time"
+
+EVENT_TYPES = [MOTION_DETECTED, DOORBELL_DING]
+
+SERVICE_GET_EVENTS = "get_events"
+SERVICE_GET_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_EVENT_TYPE): vol.All(cv.ensure_list, [vol.In(EVENT_TYPES)]),
+        vol.Optional(ATTR_START_TIME): cv.datetime,
+        vol.Optional(ATTR_END_TIME): cv.datetime,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up the Vivint services and websocket commands."""
+
+    @callback
+    def async_get_events(call: ServiceCall) -> ServiceResponse:
+        """Return recent Vivint device events."""
+        return {"events": _async_query_events(hass, call.data)}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_EVENTS,
+        async_get_events,
+        schema=SERVICE_GET_EVENTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    websocket_api.async_register_command(hass, websocket_get_events)
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): f"{DOMAIN}/events", **SERVICE_GET_EVENTS_SCHEMA.schema}
+)
+@callback
+def websocket_get_events(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return recent Vivint device events."""
+    connection.send_result(msg["id"], {"events": _async_query_events(hass, msg)})
+
+
+@callback
+def _async_query_events(hass: HomeAssistant, data: dict[str, Any]) -> list[dict]:
+    """Query the event timelines of all loaded config entries."""
+    start: datetime | None = data.get(ATTR_START_TIME)
+    end: datetime | None = data.get(ATTR_END_TIME)
+    events: list[dict] = []
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.state is not ConfigEntryState.LOADED:
+            continue
+        hub: VivintHub = entry.runtime_data
+        events.extend(
+            hub.timeline.async_query(
+                device_ids=data.get(ATTR_DEVICE_ID),
+                event_types=data.get(ATTR_EVENT_TYPE),
+                start=dt_util.as_timestamp(start) if start else None,
+                end=dt_util.as_timestamp(end) if end else None,
+            )
+        )
+    return sorted(events, key=lambda event: event["time"])
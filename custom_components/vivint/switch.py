@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from typing import Any
 
+from vivintpy.devices import VivintDevice
 from vivintpy.devices.camera import Camera
 from vivintpy.devices.switch import BinarySwitch
 from vivintpy.enums import (
@@ -15,12 +16,18 @@ from vivintpy.enums import (
 )
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import VivintConfigEntry
-from .hub import VivintBaseEntity, VivintHub, has_capability, has_feature
+from .hub import (
+    VivintBaseEntity,
+    VivintHub,
+    async_add_device_entities,
+    has_capability,
+    has_feature,
+)
 
 
 async def async_setup_entry(
@@ -29,43 +36,42 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Vivint switches using config entry."""
-    entities = []
     hub: VivintHub = entry.runtime_data
 
-    for system in hub.account.systems:
-        for alarm_panel in system.alarm_panels:
-            for device in alarm_panel.devices:
-                if isinstance(device, BinarySwitch):
-                    entities.append(
-                        VivintSwitchEntity(
-                            device=device, hub=hub, entity_description=IS_ON
-                        )
-                    )
-                if has_capability(device, Category.CAMERA, Capability.CHIME_EXTENDER):
-                    entities.append(
-                        VivintSwitchEntity(
-                            device=device,
-                            hub=hub,
-                            entity_description=CAMERA_CHIME_EXTENDER,
-                        )
+    @callback
+    def async_get_entities(devices: Iterable[VivintDevice]) -> list[VivintSwitchEntity]:
+        """Get switch entities for the given devices."""
+        entities = []
+        for device in devices:
+            if isinstance(device, BinarySwitch):
+                entities.append(
+                    VivintSwitchEntity(device=device, hub=hub, entity_description=IS_ON)
+                )
+            if has_capability(device, Category.CAMERA, Capability.CHIME_EXTENDER):
+                entities.append(
+                    VivintSwitchEntity(
+                        device=device,
+                        hub=hub,
+                        entity_description=CAMERA_CHIME_EXTENDER,
                     )
-                if has_capability(device, Category.CAMERA, Capability.PRIVACY_MODE):
-                    entities.append(
-                        VivintSwitchEntity(
-                            device=device, hub=hub, entity_description=PRIVACY_MODE
-                        )
+                )
+            if has_capability(device, Category.CAMERA, Capability.PRIVACY_MODE):
+                entities.append(
+                    VivintSwitchEntity(
+                        device=device, hub=hub, entity_description=PRIVACY_MODE
                     )
-                if has_feature(device, Feature.DETER):
-                    entities.append(
-                        VivintSwitchEntity(
-                            device=device, hub=hub, entity_description=DETER_MODE
-                        )
+                )
+            if has_feature(device, Feature.DETER):
+                entities.append(
+                    VivintSwitchEntity(
+                        device=device, hub=hub, entity_description=DETER_MODE
                     )
+                )
+        return entities
 
-    if not entities:
-        return
-
-    async_add_entities(entities)
+    entry.async_on_unload(
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
+    )
 
 
 @dataclass
@@ -120,10 +126,14 @@ class VivintSwitchEntity(VivintBaseEntity, SwitchEntity):
     device: BinarySwitch | Camera
     entity_description: VivintSwitchEntityDescription
 
+    def _get_state_snapshot(self) -> bool | None:
+        """Return whether the switch is on."""
+        return self.entity_description.is_on(self.device)
+
     @property
     def is_on(self) -> bool:
         """Return True if the switch is on."""
-        return self.entity_description.is_on(self.device)
+        return self._state_snapshot
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
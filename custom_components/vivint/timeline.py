@@ -0,0 +1,184 @@
+"""A bounded timeline of recent Vivint device events."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+import json
+import logging
+import os
+from time import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENTS_PER_DEVICE = 100
+LOG_FLUSH_SECONDS = 5
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_TAIL_BYTES = 256 * 1024
+
+
+class EventTimeline:
+    """Keep the most recent events of each device in a ring buffer.
+
+    Events are stored as (timestamp, type) tuples keyed by device registry id and can
+    optionally be appended to a JSON lines log on disk, which is used to restore the
+    ring buffers when the timeline is loaded again.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the event timeline."""
+        self._hass = hass
+        self._events: dict[str, deque[tuple[float, str]]] = {}
+        self._log_path: str | None = None
+        self._pending: list[str] = []
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    @property
+    def log_path(self) -> str | None:
+        """Return the path of the on-disk event log, if enabled."""
+        return self._log_path
+
+    def __len__(self) -> int:
+        """Return the number of events in the timeline."""
+        return sum(len(events) for events in self._events.values())
+
+    @callback
+    def async_record(
+        self, device_id: str, event_type: str, timestamp: float | None = None
+    ) -> None:
+        """Record an event for a device."""
+        if timestamp is None:
+            timestamp = time()
+        if (events := self._events.get(device_id)) is None:
+            events = self._events[device_id] = deque(maxlen=EVENTS_PER_DEVICE)
+        events.append((timestamp, event_type))
+
+        if self._log_path:
+            self._pending.append(
+                json.dumps(
+                    {"time": timestamp, "device_id": device_id, "type": event_type}
+                )
+            )
+            if not self._unsub_flush:
+                self._unsub_flush = async_call_later(
+                    self._hass, LOG_FLUSH_SECONDS, self._async_scheduled_flush
+                )
+
+    @callback
+    def async_query(
+        self,
+        device_ids: Iterable[str] | None = None,
+        event_types: Iterable[str] | None = None,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> list[dict]:
+        """Return recorded events, oldest first, matching the given filters."""
+        types = set(event_types) if event_types else None
+        results: list[tuple[float, str, str]] = []
+        for device_id in self._events if device_ids is None else device_ids:
+            # events are stored in time order, so stop at the first one before start
+            for timestamp, event_type in reversed(self._events.get(device_id, ())):
+                if start is not None and timestamp < start:
+                    break
+                if end is not None and timestamp > end:
+                    continue
+                if types is None or event_type in types:
+                    results.append((timestamp, device_id, event_type))
+
+        return [
+            {
+                "device_id": device_id,
+                "type": event_type,
+                "time": dt_util.utc_from_timestamp(timestamp).isoformat(),
+            }
+            for timestamp, device_id, event_type in sorted(results)
+        ]
+
+    async def async_enable_log(self, path: str) -> None:
+        """Enable the on-disk event log and restore recent events from it."""
+        if self._log_path == path:
+            return
+        await self.async_disable_log()
+        restored = await self._hass.async_add_executor_job(_read_log_events, path)
+        for device_id, events in restored.items():
+            merged = sorted({*events, *self._events.get(device_id, ())})
+            self._events[device_id] = deque(merged, maxlen=EVENTS_PER_DEVICE)
+        self._log_path = path
+
+    async def async_disable_log(self) -> None:
+        """Flush pending events and disable the on-disk event log."""
+        await self.async_flush()
+        self._log_path = None
+
+    async def async_flush(self) -> None:
+        """Write pending events to the on-disk event log."""
+        if self._unsub_flush:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if not self._pending or not self._log_path:
+            return
+        lines, self._pending = self._pending, []
+        await self._hass.async_add_executor_job(_append_log, self._log_path, lines)
+
+    async def _async_scheduled_flush(self, *_) -> None:
+        """Flush pending events after the flush delay."""
+        self._unsub_flush = None
+        await self.async_flush()
+
+
+def _read_log_tail(path: str) -> list[str]:
+    """Read the last lines of an event log."""
+    try:
+        with open(path, "rb") as file:
+            file.seek(0, os.SEEK_END)
+            size = file.tell()
+            file.seek(max(0, size - LOG_TAIL_BYTES))
+            data = file.read()
+    except FileNotFoundError:
+        return []
+    lines = data.decode("utf-8", errors="ignore").splitlines()
+    # the first line may have been cut in half by seeking into the file
+    return lines[1:] if size > LOG_TAIL_BYTES else lines
+
+
+def _read_log_events(path: str) -> dict[str, list[tuple[float, str]]]:
+    """Read and parse the last events of an event log by device."""
+    restored: dict[str, list[tuple[float, str]]] = {}
+    for line in _read_log_tail(path):
+        try:
+            event = json.loads(line)
+            restored.setdefault(event["device_id"], []).append(
+                (float(event["time"]), event["type"])
+            )
+        except (ValueError, KeyError, TypeError):
+            continue
+    return restored
+
+
+def remove_log(path: str) -> None:
+    """Remove an event log and its rotated log."""
+    for log_path in (path, f"{path}.1"):
+        try:
+            os.remove(log_path)
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            _LOGGER.error("Unable to remove Vivint event log %s: %s", log_path, err)
+
+
+def _append_log(path: str, lines: list[str]) -> None:
+    """Append lines to an event log, rotating it once it grows too large."""
+    try:
+        if os.path.getsize(path) > LOG_MAX_BYTES:
+            os.replace(path, f"{path}.1")
+    except FileNotFoundError:
+        pass
+    try:
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+    except OSError as err:
+        _LOGGER.error("Unable to write Vivint event log %s: %s", path, err)
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+from collections.abc import Iterable
 from typing import Any
 
+from vivintpy.devices import VivintDevice
 from vivintpy.devices.alarm_panel import AlarmPanel
 from vivintpy.entity import UPDATE
 
@@ -14,14 +15,13 @@ from homeassistant.components.update import (
     UpdateEntityDescription,
     UpdateEntityFeature as Feature,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import VivintConfigEntry
-from .hub import VivintBaseEntity, VivintHub
-
-SCAN_INTERVAL = timedelta(days=1)
+from .firmware import get_panel_device, is_update_in_progress
+from .hub import VivintBaseEntity, VivintHub, async_add_device_entities
 
 FIRMWARE_UPDATE_ENTITY = UpdateEntityDescription(
     key="firmware", name="Firmware", device_class=UpdateDeviceClass.FIRMWARE
@@ -35,15 +35,21 @@ async def async_setup_entry(
 ) -> None:
     """Set up Vivint update platform."""
     hub: VivintHub = entry.runtime_data
-    entities = [
-        VivintUpdateEntity(
-            device=alarm_panel, hub=hub, entity_description=FIRMWARE_UPDATE_ENTITY
-        )
-        for system in hub.account.systems
-        if system.is_admin
-        for alarm_panel in system.alarm_panels
-    ]
-    async_add_entities(entities, True)
+
+    @callback
+    def async_get_entities(devices: Iterable[VivintDevice]) -> list[VivintUpdateEntity]:
+        """Get firmware update entities for the given devices."""
+        return [
+            VivintUpdateEntity(
+                device=device, hub=hub, entity_description=FIRMWARE_UPDATE_ENTITY
+            )
+            for device in devices
+            if isinstance(device, AlarmPanel) and device.system.is_admin
+        ]
+
+    entry.async_on_unload(
+        async_add_device_entities(hub, async_add_entities, async_get_entities)
+    )
 
 
 class VivintUpdateEntity(VivintBaseEntity, UpdateEntity):
@@ -53,13 +59,14 @@ class VivintUpdateEntity(VivintBaseEntity, UpdateEntity):
 
     _attr_supported_features = Feature.INSTALL | Feature.PROGRESS
 
+    def _get_state_snapshot(self) -> tuple[bool, str]:
+        """Return the install state and version reported by the panel."""
+        return (self.in_progress, self.installed_version)
+
     @property
     def in_progress(self) -> bool:
         """Update installation progress."""
-        return self.device._AlarmPanel__panel.data["sus"] not in (
-            "Idle",
-            "Reboot Pending",
-        )
+        return is_update_in_progress(self.device)
 
     @property
     def installed_version(self) -> str:
@@ -67,33 +74,40 @@ class VivintUpdateEntity(VivintBaseEntity, UpdateEntity):
         return self.device.software_version
 
     @property
-    def should_poll(self) -> bool:
-        """Set polling to True."""
-        return True
-
-    async def async_update(self) -> None:
-        """Update the entity."""
-        software_update = await self.device.get_software_update_details()
-        if software_update.get("available"):
-            latest_version = software_update["available_version"]
-        else:
-            latest_version = self.device.software_version
-        self._attr_latest_version = latest_version
+    def latest_version(self) -> str | None:
+        """Latest version available for install."""
+        if (details := self.hub.manager.firmware.get_details(self.device)) is None:
+            return None
+        if details.get("available"):
+            return details["available_version"]
+        return self.device.software_version
 
     async def async_install(
         self, version: str | None, backup: bool, **kwargs: Any
     ) -> None:
         """Install an update."""
-        if (await self.device.get_software_update_details()).get("available"):
-            if not await self.device.update_software():
-                message = f"Unable to start firmware update on {self.device.name}"
-                raise HomeAssistantError(message)
+        if not await self.hub.manager.firmware.async_install(self.device):
+            message = f"Unable to start firmware update on {self.device.name}"
+            raise HomeAssistantError(message)
 
     async def async_added_to_hass(self) -> None:
-        """Set up a listener for the entity."""
+        """Set up listeners for the panel and its firmware update checks."""
         await super().async_added_to_hass()
+        if panel_device := get_panel_device(self.device):
+            self.async_on_remove(
+                self.hub.async_subscribe(
+                    panel_device, UPDATE, self._async_device_updated
+                )
+            )
         self.async_on_remove(
-            self.device._AlarmPanel__panel.on(
-                UPDATE, lambda _: self.async_write_ha_state()
+            self.hub.manager.firmware.async_register(
+                self.device, self.async_write_ha_state, self.hub.async_refresh_system
             )
         )
+
+    @callback
+    def _async_device_updated(self, data: dict) -> None:
+        """Follow installs reported by the panel and update the state."""
+        if self.in_progress:
+            self.hub.manager.firmware.async_track_install(self.device)
+        super()._async_device_updated(data)
@@ -0,0 +1,80 @@
+"""Compare decoding Vivint payloads with the standard library and orjson.
+
+Pass recorded response bodies, such as the system data logged by vivintpy at debug
+level, to benchmark them. Without arguments a synthetic system payload and a burst
+of realtime device messages are used.
+
+    python scripts/benchmark_json.py [payload.json ...]
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+import timeit
+
+import orjson
+
+DEVICES = 150
+MESSAGES = 500
+
+
+def synthetic_payloads() -> dict[str, bytes]:
+    """Return a system payload and a burst of realtime messages."""
+    devices = [
+        {
+            "_id": device_id,
+            "n": f"Device {device_id}",
+            "t": "wireless_sensor",
+            "s": device_id % 2 == 0,
+            "bl": 100 - device_id % 40,
+            "caps": [{"c": 1, "ca": [1, 2, 3]}],
+            "ser": f"{device_id:010d}",
+            "ver": "1.2.3",
+        }
+        for device_id in range(DEVICES)
+    ]
+    system = {
+        "system": {
+            "panid": 123456,
+            "par": [{"panid": 123456, "parid": 1, "s": 0, "sus": "Idle", "d": devices}],
+        }
+    }
+    messages = [
+        {"t": "account_partition", "panid": 123456, "parid": 1, "da": {"d": [device]}}
+        for device in devices * (MESSAGES // DEVICES)
+    ]
+    return {
+        "system data": json.dumps(system).encode(),
+        "realtime burst": json.dumps(messages).encode(),
+    }
+
+
+def benchmark(name: str, body: bytes) -> None:
+    """Print the decode time of a payload with both decoders."""
+    number = max(1, 2_000_000 // len(body))
+    stdlib = min(
+        timeit.repeat(lambda: json.loads(body.decode()), number=number, repeat=5)
+    )
+    fast = min(timeit.repeat(lambda: orjson.loads(body), number=number, repeat=5))
+    print(
+        f"{name:30} {len(body) / 1024:8.1f} KiB  "
+        f"json {stdlib / number * 1e3:8.3f} ms  "
+        f"orjson {fast / number * 1e3:8.3f} ms  "
+        f"{stdlib / fast:5.1f}x"
+    )
+
+
+def main() -> None:
+    """Benchmark the given payloads or synthetic ones."""
+    if paths := sys.argv[1:]:
+        payloads = {Path(path).name: Path(path).read_bytes() for path in paths}
+    else:
+        payloads = synthetic_payloads()
+    for name, body in payloads.items():
+        benchmark(name, body)
+
+
+if __name__ == "__main__":
+    main()
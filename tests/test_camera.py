@@ -0,0 +1,112 @@
+"""Tests for the Vivint camera entity."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.vivint.camera import VivintCameraEntity
+from homeassistant.core import HomeAssistant
+
+FRAME = b"frame"
+NEW_FRAME = b"new frame"
+
+
+def make_camera(hass: HomeAssistant) -> VivintCameraEntity:
+    """Return a reachable camera entity."""
+    device = MagicMock(
+        id=5,
+        panel_id=1,
+        mac_address="00:11:22:33:44:55",
+        is_online=True,
+        is_in_privacy_mode=False,
+        is_subdevice=False,
+    )
+    device.name = "Front door"
+    device.alarm_panel.id = 1
+    device.alarm_panel.get_panel_credentials = AsyncMock()
+    device.get_rtsp_access_url.return_value = "rtsp://camera"
+    hub = MagicMock(options={}, camera_stream_quality={})
+    camera = VivintCameraEntity(device, hub)
+    camera.hass = hass
+    return camera
+
+
+@pytest.fixture
+def get_image() -> AsyncMock:
+    """Mock capturing a frame from the camera stream."""
+    with patch(
+        "custom_components.vivint.camera.async_get_image", return_value=FRAME
+    ) as get_image:
+        yield get_image
+
+
+@pytest.fixture
+def scale_image() -> MagicMock:
+    """Mock resizing a frame."""
+    with patch(
+        "custom_components.vivint.camera.scale_jpeg_camera_image",
+        side_effect=lambda image, width, height: (image.content, width, height),
+    ) as scale_image:
+        yield scale_image
+
+
+async def test_variant_cache_hit(
+    hass: HomeAssistant, get_image: AsyncMock, scale_image: MagicMock
+) -> None:
+    """Test that a resized variant is derived once per frame."""
+    camera = make_camera(hass)
+
+    assert await camera.async_camera_image(100, 50) == (FRAME, 100, 50)
+    assert await camera.async_camera_image(100, 50) == (FRAME, 100, 50)
+    assert await camera.async_camera_image() == FRAME
+
+    get_image.assert_awaited_once()
+    scale_image.assert_called_once()
+
+
+async def test_variant_cache_miss(
+    hass: HomeAssistant, get_image: AsyncMock, scale_image: MagicMock
+) -> None:
+    """Test that each size derives its own variant from the same frame."""
+    camera = make_camera(hass)
+
+    assert await camera.async_camera_image(100, 50) == (FRAME, 100, 50)
+    assert await camera.async_camera_image(200, 100) == (FRAME, 200, 100)
+
+    get_image.assert_awaited_once()
+    assert scale_image.call_count == 2
+
+
+async def test_variant_cache_new_frame(
+    hass: HomeAssistant, get_image: AsyncMock, scale_image: MagicMock
+) -> None:
+    """Test that a new frame replaces the cached variants."""
+    camera = make_camera(hass)
+    await camera.async_camera_image(100, 50)
+
+    get_image.return_value = NEW_FRAME
+    camera._async_invalidate_image({})
+
+    assert await camera.async_camera_image(100, 50) == (NEW_FRAME, 100, 50)
+    assert await camera.async_camera_image() == NEW_FRAME
+    assert get_image.await_count == 2
+    assert scale_image.call_count == 2
+
+
+async def test_unreachable_camera_returns_no_image(
+    hass: HomeAssistant, get_image: AsyncMock, scale_image: MagicMock
+) -> None:
+    """Test that cameras in privacy mode return and keep no frame."""
+    camera = make_camera(hass)
+    await camera.async_camera_image()
+    await camera.async_camera_image(100, 50)
+
+    camera.device.is_in_privacy_mode = True
+    camera._async_drop_image()
+    assert await camera.async_camera_image() is None
+    assert await camera.async_camera_image(100, 50) is None
+
+    # the frame from before privacy mode is not served once the camera is back
+    camera.device.is_in_privacy_mode = False
+    assert await camera.async_camera_image() is None
+    get_image.assert_awaited_once()
@@ -0,0 +1,158 @@
+"""Tests for the Vivint firmware update scheduler."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from vivintpy.enums import DeviceType
+from vivintpy.exceptions import VivintSkyApiError
+
+from custom_components.vivint.firmware import (
+    CHECK_RETRY_SECONDS,
+    INSTALL_POLL_SECONDS,
+    FirmwareUpdateScheduler,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+DETAILS = {"available": True, "available_version": "1.2.3"}
+
+
+class Clock:
+    """A monotonic clock that only advances when told to."""
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self.now = self.start = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    """Freeze the clock of the firmware scheduler."""
+    clock = Clock()
+    with patch("custom_components.vivint.firmware.monotonic", clock):
+        yield clock
+
+
+def make_panel(
+    panel_id: int = 1, partition_id: int = 1, status: str = "Idle"
+) -> MagicMock:
+    """Return an alarm panel with software update details."""
+    panel = MagicMock(id=panel_id, partition_id=partition_id)
+    panel.devices = [MagicMock(data={"t": DeviceType.PANEL.value, "sus": status})]
+    panel.get_software_update_details = AsyncMock(return_value=DETAILS)
+    panel.update_software = AsyncMock(return_value=True)
+    return panel
+
+
+async def advance(hass: HomeAssistant, clock: Clock, seconds: float) -> None:
+    """Advance the time and run the checks that are due."""
+    clock.now += seconds
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=clock.now - clock.start)
+    )
+    await hass.async_block_till_done()
+
+
+async def test_register_checks_panel(hass: HomeAssistant, clock: Clock) -> None:
+    """Test that a registered panel is checked and its listener notified."""
+    scheduler = FirmwareUpdateScheduler(hass)
+    panel = make_panel()
+    listener = MagicMock()
+    unregister = scheduler.async_register(panel, listener, AsyncMock())
+
+    await advance(hass, clock, 1)
+
+    panel.get_software_update_details.assert_awaited_once()
+    listener.assert_called_once()
+    assert scheduler.get_details(panel) == DETAILS
+    unregister()
+
+
+async def test_rebuilt_panel_reuses_details(hass: HomeAssistant, clock: Clock) -> None:
+    """Test that a rebuilt panel object shares the state of its id and partition."""
+    scheduler = FirmwareUpdateScheduler(hass)
+    panel = make_panel()
+    unregister = scheduler.async_register(panel, MagicMock(), AsyncMock())
+    await advance(hass, clock, 1)
+
+    rebuilt = make_panel()
+    unregister_rebuilt = scheduler.async_register(rebuilt, MagicMock(), AsyncMock())
+    await advance(hass, clock, 1)
+
+    assert scheduler.get_details(rebuilt) == DETAILS
+    rebuilt.get_software_update_details.assert_not_awaited()
+    assert scheduler.get_details(make_panel(partition_id=2)) is None
+    unregister()
+    unregister_rebuilt()
+
+
+async def test_failed_checks_back_off(hass: HomeAssistant, clock: Clock) -> None:
+    """Test that failed checks are retried with exponential backoff."""
+    scheduler = FirmwareUpdateScheduler(hass)
+    panel = make_panel()
+    panel.get_software_update_details.side_effect = VivintSkyApiError("error")
+    unregister = scheduler.async_register(panel, MagicMock(), AsyncMock())
+
+    await advance(hass, clock, 1)
+    assert panel.get_software_update_details.await_count == 1
+
+    await advance(hass, clock, CHECK_RETRY_SECONDS - 1)
+    assert panel.get_software_update_details.await_count == 1
+    await advance(hass, clock, 1)
+    assert panel.get_software_update_details.await_count == 2
+
+    await advance(hass, clock, CHECK_RETRY_SECONDS)
+    assert panel.get_software_update_details.await_count == 2
+    await advance(hass, clock, CHECK_RETRY_SECONDS)
+    assert panel.get_software_update_details.await_count == 3
+
+    panel.get_software_update_details.side_effect = None
+    await advance(hass, clock, 4 * CHECK_RETRY_SECONDS)
+    assert scheduler.get_details(panel) == DETAILS
+    assert not scheduler._failures
+    unregister()
+
+
+async def test_install_refreshes_system(hass: HomeAssistant, clock: Clock) -> None:
+    """Test that the system is refreshed through the hub while installing."""
+    scheduler = FirmwareUpdateScheduler(hass)
+    panel = make_panel(status="Installing")
+    refresh_system = AsyncMock()
+    unregister = scheduler.async_register(panel, MagicMock(), refresh_system)
+    await advance(hass, clock, 1)
+
+    assert await scheduler.async_install(panel)
+    await advance(hass, clock, INSTALL_POLL_SECONDS)
+
+    refresh_system.assert_awaited_once_with(panel.system)
+    unregister()
+
+
+async def test_unregister_last_listener_forgets_panel(
+    hass: HomeAssistant, clock: Clock
+) -> None:
+    """Test that a panel is forgotten once its last listener unregisters."""
+    scheduler = FirmwareUpdateScheduler(hass)
+    panel = make_panel()
+    unregister_first = scheduler.async_register(panel, MagicMock(), AsyncMock())
+    unregister_second = scheduler.async_register(panel, MagicMock(), AsyncMock())
+    await advance(hass, clock, 1)
+    scheduler.async_track_install(panel)
+
+    unregister_first()
+    assert scheduler.get_details(panel) == DETAILS
+
+    unregister_second()
+    assert scheduler.get_details(panel) is None
+    assert not scheduler._panels
+    assert not scheduler._listeners
+    assert not scheduler._details
+    assert not scheduler._installing
+    assert not scheduler._failures
+    assert scheduler._unsub_timer is None
@@ -0,0 +1,86 @@
+"""Tests for the Vivint hub helpers."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.vivint.hub import DeviceTriggerIndex, ExpiryScheduler
+from homeassistant.core import Context, HomeAssistant
+from homeassistant.util import dt as dt_util
+
+
+def fire_in(hass: HomeAssistant, seconds: float) -> None:
+    """Fire the timers that are due within `seconds`."""
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+
+
+async def test_expiry_scheduler_runs_due_actions(hass: HomeAssistant) -> None:
+    """Test that actions run once their delay passed."""
+    scheduler = ExpiryScheduler(hass)
+    first, second = MagicMock(), MagicMock()
+    scheduler.async_schedule("first", 10, first)
+    scheduler.async_schedule("second", 30, second)
+
+    fire_in(hass, 5)
+    first.assert_not_called()
+
+    fire_in(hass, 12)
+    first.assert_called_once()
+    second.assert_not_called()
+
+    fire_in(hass, 32)
+    second.assert_called_once()
+    first.assert_called_once()
+
+
+async def test_expiry_scheduler_reschedule(hass: HomeAssistant) -> None:
+    """Test that scheduling a key again replaces its pending expiry."""
+    scheduler = ExpiryScheduler(hass)
+    old, new = MagicMock(), MagicMock()
+    scheduler.async_schedule("motion", 10, old)
+    scheduler.async_schedule("motion", 30, new)
+
+    fire_in(hass, 12)
+    old.assert_not_called()
+    new.assert_not_called()
+
+    fire_in(hass, 32)
+    old.assert_not_called()
+    new.assert_called_once()
+
+
+async def test_expiry_scheduler_cancel_and_shutdown(hass: HomeAssistant) -> None:
+    """Test that cancelled and shut down expirations do not run."""
+    scheduler = ExpiryScheduler(hass)
+    cancelled, dropped = MagicMock(), MagicMock()
+    scheduler.async_schedule("cancelled", 10, cancelled)
+    scheduler.async_schedule("dropped", 20, dropped)
+
+    scheduler.async_cancel("cancelled")
+    fire_in(hass, 12)
+    cancelled.assert_not_called()
+
+    scheduler.async_shutdown()
+    fire_in(hass, 22)
+    dropped.assert_not_called()
+
+
+def test_device_trigger_index_passes_context() -> None:
+    """Test that triggers get the event data and context of their device and type."""
+    index = DeviceTriggerIndex()
+    motion, ding = MagicMock(), MagicMock()
+    detach = index.async_attach("device", "motion", motion)
+    index.async_attach("device", "ding", ding)
+    context = Context()
+
+    index.async_fire("device", "motion", {"type": "motion"}, context)
+    index.async_fire("other", "motion", {"type": "motion"}, context)
+
+    motion.assert_called_once_with({"type": "motion"}, context)
+    ding.assert_not_called()
+
+    detach()
+    index.async_fire("device", "motion", {"type": "motion"}, context)
+    motion.assert_called_once()
+    assert len(index) == 1
@@ -0,0 +1,25 @@
+"""Tests for the Vivint hub manager."""
+
+from custom_components.vivint.manager import RequestBudget
+
+
+async def test_request_budget_burst() -> None:
+    """Test that requests within the burst are not throttled."""
+    budget = RequestBudget(rate=1, burst=3)
+
+    for _ in range(3):
+        await budget.async_acquire()
+
+    assert budget.requests == 3
+    assert budget.throttled == 0
+
+
+async def test_request_budget_throttles() -> None:
+    """Test that requests wait for a token once the burst is used up."""
+    budget = RequestBudget(rate=100, burst=2)
+
+    for _ in range(4):
+        await budget.async_acquire()
+
+    assert budget.requests == 4
+    assert budget.throttled == 2
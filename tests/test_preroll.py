@@ -0,0 +1,104 @@
+"""Tests for the camera pre-roll buffer."""
+
+from unittest.mock import AsyncMock, patch
+
+from custom_components.vivint.preroll import TS_PACKET_BYTES, PrerollBuffer
+from homeassistant.core import HomeAssistant
+
+VIDEO_PID = 0x100
+PMT_PID = 0x1000
+
+
+def make_packet(pid: int, keyframe: bool = False) -> bytes:
+    """Return an MPEG-TS packet, starting a keyframe if requested."""
+    packet = bytearray(TS_PACKET_BYTES)
+    packet[0:3] = (0x47, 0x40 | pid >> 8, pid & 0xFF)
+    if keyframe:
+        # adaptation field with the random access indicator set
+        packet[3:6] = (0x30, 7, 0x40)
+    else:
+        packet[3] = 0x10
+    return bytes(packet)
+
+
+def make_pat() -> bytes:
+    """Return a PAT packet listing a single program."""
+    packet = bytearray(make_packet(0))
+    packet[4] = 0
+    packet[5:17] = (0x00, 0xB0, 13, 0, 1, 0xC1, 0, 0, 0, 1, 0xE0 | PMT_PID >> 8, 0)
+    return bytes(packet)
+
+
+def make_gop(frames: int = 3) -> bytes:
+    """Return a keyframe followed by other video packets."""
+    return make_packet(VIDEO_PID, keyframe=True) + make_packet(VIDEO_PID) * frames
+
+
+def make_buffer(hass: HomeAssistant, **kwargs) -> PrerollBuffer:
+    """Return a pre-roll buffer that is not running."""
+    return PrerollBuffer(hass, "camera.test", AsyncMock(return_value=None), **kwargs)
+
+
+async def test_append_trims_to_keyframe(hass: HomeAssistant) -> None:
+    """Test that the buffer always starts at a keyframe."""
+    buffer = make_buffer(hass, seconds=10)
+
+    buffer._append(make_packet(VIDEO_PID) * 4)
+    assert buffer.size == 0
+
+    buffer._append(make_packet(VIDEO_PID) + make_gop())
+    assert buffer.size == len(make_gop())
+    assert all(keyframe for _, _, keyframe in buffer._chunks)
+
+
+async def test_append_splits_at_keyframes(hass: HomeAssistant) -> None:
+    """Test that chunks are split before each keyframe."""
+    buffer = make_buffer(hass, seconds=10)
+
+    buffer._append(make_gop(2) + make_gop(1) + make_packet(VIDEO_PID))
+
+    assert [(len(chunk), keyframe) for _, chunk, keyframe in buffer._chunks] == [
+        (3 * TS_PACKET_BYTES, True),
+        (3 * TS_PACKET_BYTES, True),
+    ]
+
+
+async def test_append_trims_by_size(hass: HomeAssistant) -> None:
+    """Test that whole keyframe intervals are dropped over the memory limit."""
+    gop = make_gop()
+    buffer = make_buffer(hass, seconds=10, max_bytes=2 * len(gop))
+
+    for _ in range(3):
+        buffer._append(gop)
+
+    assert buffer.size == 2 * len(gop)
+    assert len(buffer._chunks) == 2
+
+
+async def test_append_trims_by_age(hass: HomeAssistant) -> None:
+    """Test that chunks older than the buffer duration are dropped."""
+    buffer = make_buffer(hass, seconds=10)
+
+    with patch("custom_components.vivint.preroll.monotonic", return_value=100):
+        buffer._append(make_gop())
+        buffer._append(make_packet(VIDEO_PID))
+    with patch("custom_components.vivint.preroll.monotonic", return_value=105):
+        buffer._append(make_gop())
+    assert len(buffer._chunks) == 3
+
+    with patch("custom_components.vivint.preroll.monotonic", return_value=111):
+        buffer._append(make_packet(VIDEO_PID))
+    assert [time for time, _, _ in buffer._chunks] == [105, 111]
+    assert buffer.size == len(make_gop()) + TS_PACKET_BYTES
+
+
+async def test_append_keeps_pat_and_pmt(hass: HomeAssistant) -> None:
+    """Test that the latest PAT and PMT are kept for clips."""
+    buffer = make_buffer(hass, seconds=10)
+    pat, pmt = make_pat(), make_packet(PMT_PID)
+
+    buffer._append(pat + pmt + make_gop())
+
+    assert buffer._pat == pat
+    assert buffer._pmt == pmt
+    assert buffer.size == len(make_gop())
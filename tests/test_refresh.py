@@ -0,0 +1,166 @@
+"""Tests for diffing and applying Vivint system refreshes."""
+
+from copy import deepcopy
+from unittest.mock import MagicMock
+
+from vivintpy.const import AlarmPanelAttribute as Attribute, SystemAttribute
+
+from custom_components.vivint.refresh import (
+    apply_system_diff,
+    diff_system,
+    snapshot_system,
+)
+
+PANEL_ID = 123
+PARTITION_ID = 1
+
+
+def make_panel_data(*devices: dict, **attributes) -> dict:
+    """Return the raw data of an alarm panel."""
+    return {
+        Attribute.PANEL_ID: PANEL_ID,
+        Attribute.PARTITION_ID: PARTITION_ID,
+        Attribute.STATE: 0,
+        Attribute.DEVICES: list(devices),
+        **attributes,
+    }
+
+
+def make_system_data(*panels: dict) -> dict:
+    """Return the raw data of a system refresh."""
+    return {SystemAttribute.SYSTEM: {SystemAttribute.PARTITION: list(panels)}}
+
+
+def make_device(data: dict) -> MagicMock:
+    """Return a device whose data is replaced by `update_data`."""
+    device = MagicMock(data=data)
+
+    def update_data(new_val: dict, override: bool = False) -> None:
+        device.data = new_val
+
+    device.update_data.side_effect = update_data
+    return device
+
+
+def make_system(panel_data: dict) -> MagicMock:
+    """Return a system with a single alarm panel built from raw data."""
+    panel = make_device(panel_data)
+    panel.id = PANEL_ID
+    panel.partition_id = PARTITION_ID
+    panel.devices = [
+        make_device(dict(device_data)) for device_data in panel_data[Attribute.DEVICES]
+    ]
+    return MagicMock(alarm_panels=[panel])
+
+
+def test_diff_unchanged_system() -> None:
+    """Test that an unchanged refresh has no changes."""
+    panel_data = make_panel_data({Attribute.ID: 1, Attribute.STATE: False})
+    system = make_system(panel_data)
+
+    assert (
+        diff_system(make_system_data(deepcopy(panel_data)), snapshot_system(system))
+        == []
+    )
+
+
+def test_diff_changed_device() -> None:
+    """Test that only changed devices are reported."""
+    panel_data = make_panel_data(
+        {Attribute.ID: 1, Attribute.STATE: False},
+        {Attribute.ID: 2, Attribute.STATE: False},
+    )
+    system = make_system(panel_data)
+    refreshed = deepcopy(panel_data)
+    refreshed[Attribute.DEVICES][1][Attribute.STATE] = True
+
+    [diff] = diff_system(make_system_data(refreshed), snapshot_system(system))
+
+    assert not diff.needs_refresh
+    assert not diff.panel_changed
+    assert diff.changed_devices == [{Attribute.ID: 2, Attribute.STATE: True}]
+
+
+def test_diff_changed_panel() -> None:
+    """Test that a changed panel attribute is reported."""
+    panel_data = make_panel_data({Attribute.ID: 1})
+    system = make_system(panel_data)
+
+    [diff] = diff_system(
+        make_system_data(make_panel_data({Attribute.ID: 1}, **{Attribute.STATE: 3})),
+        snapshot_system(system),
+    )
+
+    assert diff.panel_changed
+    assert not diff.needs_refresh
+    assert not diff.changed_devices
+
+
+def test_diff_new_device_and_panel() -> None:
+    """Test that new devices and panels need a full refresh."""
+    panel_data = make_panel_data({Attribute.ID: 1})
+    system = make_system(panel_data)
+    new_panel = make_panel_data() | {Attribute.PARTITION_ID: 2}
+
+    diffs = diff_system(
+        make_system_data(
+            make_panel_data({Attribute.ID: 1}, {Attribute.ID: 2}), new_panel
+        ),
+        snapshot_system(system),
+    )
+
+    assert [diff.needs_refresh for diff in diffs] == [True, True]
+    assert diffs[1].data is new_panel
+
+
+def test_apply_changed_devices() -> None:
+    """Test that changed devices are updated and written back to the panel."""
+    panel_data = make_panel_data(
+        {Attribute.ID: 1, Attribute.STATE: False},
+        {Attribute.ID: 2, Attribute.STATE: False},
+    )
+    system = make_system(panel_data)
+    panel = system.alarm_panels[0]
+    refreshed = deepcopy(panel_data)
+    refreshed[Attribute.DEVICES][0][Attribute.STATE] = True
+
+    updated = apply_system_diff(
+        system, diff_system(make_system_data(refreshed), snapshot_system(system))
+    )
+
+    assert updated == {panel.devices[0]}
+    assert panel.devices[0].data == {Attribute.ID: 1, Attribute.STATE: True}
+    panel.update_data.assert_not_called()
+    panel.devices[1].update_data.assert_not_called()
+    assert panel.data[Attribute.DEVICES] == refreshed[Attribute.DEVICES]
+    assert diff_system(make_system_data(refreshed), snapshot_system(system)) == []
+
+
+def test_apply_changed_panel() -> None:
+    """Test that a changed panel is updated with its refreshed data."""
+    panel_data = make_panel_data({Attribute.ID: 1})
+    system = make_system(panel_data)
+    panel = system.alarm_panels[0]
+    refreshed = make_panel_data({Attribute.ID: 1}, **{Attribute.STATE: 3})
+
+    updated = apply_system_diff(
+        system, diff_system(make_system_data(refreshed), snapshot_system(system))
+    )
+
+    assert updated == {panel}
+    panel.update_data.assert_called_once_with(refreshed, override=True)
+
+
+def test_apply_new_devices() -> None:
+    """Test that panels with new devices are refreshed by vivintpy."""
+    panel_data = make_panel_data({Attribute.ID: 1})
+    system = make_system(panel_data)
+    panel = system.alarm_panels[0]
+    refreshed = make_panel_data({Attribute.ID: 1}, {Attribute.ID: 2})
+
+    updated = apply_system_diff(
+        system, diff_system(make_system_data(refreshed), snapshot_system(system))
+    )
+
+    panel.refresh.assert_called_once_with(refreshed)
+    assert updated == {panel, *panel.devices}
@@ -0,0 +1,17 @@
+"""Tests for decoding Vivint API responses."""
+
+import math
+
+from custom_components.vivint.response import decode_json
+
+
+def test_decode_json() -> None:
+    """Test that JSON bodies are decoded."""
+    assert decode_json(b'{"a": [1, "b"]}') == {"a": [1, "b"]}
+
+
+def test_decode_json_fallback() -> None:
+    """Test that documents orjson rejects are decoded by the standard library."""
+    assert math.isnan(decode_json(b'{"a": NaN}')["a"])
+    assert decode_json(b"[18446744073709551616]") == [2**64]
+    assert decode_json('{"a": "é"}'.encode("latin-1"), "latin-1") == {"a": "é"}